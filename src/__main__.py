@@ -1,408 +1,344 @@
-from tkinter.filedialog import askopenfilename as fname, asksaveasfilename as sname
-from tkinter.messagebox import showinfo, showerror
-from dataclasses import dataclass, field
-from hashlib import sha256
-from tkinter import (
-    DISABLED,
-    Button,
-    Checkbutton,
-    Entry,
-    Label,
-    Toplevel,
-    StringVar,
-    Frame,
-    Tk,
-    Menu,
-    IntVar,
-)
-from sqlite3 import IntegrityError as IE
-from ttkwidgets.autocomplete import AutocompleteCombobox
+from argparse import ArgumentParser
+import csv
+import json
+import sys
 import nodes as nd
 
 
-@dataclass(slots=True)
-class File:
-    PATH: StringVar = field(repr=False)
-    DIR: str = field(default="./", init=False, repr=False)
-    TYPE: str = field(default=".db", init=False, repr=False)
-
-
-@dataclass(slots=True)
-class DatabaseStructure:
-    TABLE_NAME: str = field(default="Paths", init=False, repr=False)
-    COLUMNS: tuple[tuple[str]] = (
-        ("ID", "text", "PRIMARY KEY"),
-        ("Start", "text", "NOT NULL"),
-        ("End", "text", "NOT NULL"),
-        ("Length", "integer", "NOT NULL"),
-    )
-    COLUMNS_NAMES: list[str] = ("ID", "Start", "End", "Length")
-
-
-class BetterAutocompleteCombobox(AutocompleteCombobox):
-    def __init__(self, master=None, completevalues=None, **kwargs):
-        super().__init__(master, completevalues, **kwargs)
-
-    def get_val(self):
-        result = self.get()
-        self.set(str())
-        return result
-
-
-class BetterEntry(Entry):
-    def __init__(self, master=None, **kwargs) -> None:
-        self.var = StringVar()
-        Entry.__init__(self, master, textvariable=self.var, **kwargs)
-
-    def get(self) -> str:
-        result = super().get()
-        self.var.set(str())
-        return result
+def read_nodes(fname: str) -> list[str]:
+    """
+    Function to read one node name per line from a file
+    @param fname The file to read
+    @returns The list of node names
+    """
+    with open(fname, encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def matrix(args) -> None:
+    with nd.Database(args.database) as db:
+        graph = nd.load_snapshot(db)
+    sources = read_nodes(args.sources) if args.sources else graph.names
+    targets = read_nodes(args.targets) if args.targets else None
+    rows = nd.distance_matrix(graph, sources, targets, args.workers)
+    if args.csv:
+        count = nd.export_matrix(rows, args.csv, args.batch_size)
+        print(f"{count} distances written to {args.csv}", file=sys.stderr)
+        return
+    with nd.Database(args.output or args.database) as db:
+        db.remove_table(args.table)
+        count = nd.write_matrix(db, rows, args.table, args.batch_size)
+    print(f"{count} distances written to {args.table}")
+
+
+def import_(args) -> None:
+    def progress(rows: int, seconds: float) -> None:
+        print(
+            f"{rows} rows in {seconds:.1f}s ({rows / max(seconds, 1e-9):.0f} rows/s)",
+            file=sys.stderr,
+        )
 
+    edges = nd.read_edges(args.file, args.delimiter, args.header)
+    with nd.Database(args.database) as db:
+        if args.compact:
+            nd.migrate_to_compact(db)
+        nd.import_edges(
+            db,
+            edges,
+            batch_size=args.batch_size,
+            cache_size=args.cache_size,
+            progress=progress,
+        )
 
-class OnlyIntEntry(BetterEntry):
-    def __init__(self, master=None, **kwargs) -> None:
-        BetterEntry.__init__(self, master, **kwargs)
-        self.old_value = ""
-        self.var.trace("w", self.check)
 
-    def check(self, *args) -> None:
-        if self.var.get().isdigit() or self.var.get() == "":
-            # the current value is only digits; allow this
-            self.old_value = self.var.get()
-        else:
-            # there's non-digit characters in the input; reject this
-            self.var.set(self.old_value)
+def migrate(args) -> None:
+    with nd.Database(args.database) as db:
+        if nd.schema_version(db) == 2:
+            print(f"{args.database} is already compact", file=sys.stderr)
+            return
+        count = nd.migrate_to_compact(db, args.keep)
+        if not args.keep:
+            db.conn.commit()
+            db.query("VACUUM")
+    print(f"{count} edges migrated", file=sys.stderr)
+
+
+def export(args) -> None:
+    with nd.Database(args.database) as db:
+        count = nd.export_table(
+            db,
+            args.table,
+            args.output,
+            args.columns,
+            args.where,
+            order=args.order,
+            chunk_size=args.batch_size,
+        )
+    print(f"{count} rows written to {args.output}", file=sys.stderr)
 
 
-def id_generator(input_string: str) -> int:
+def read_pairs(fname: str, delimiter: str = None):
     """
-    Function to generate a unique id for a given string
-    @param input The string to generate an id for
-    @returns The id for the given string
+    Function to read the start, end pairs to query, one per line
+    @param fname The file to read, - for the standard input
+    @param delimiter The column delimiter, a tab for .tsv files and a comma otherwise
     """
-    return sha256(input_string.encode("utf-8")).hexdigest()
-
-
-class MainWindow(Tk):
-    def init_graph(self) -> dict[str, dict[str, int]]:
-        with nd.Database(self.cursor.PATH.get()) as db:
-            self.list_all = db.get(self.struct.TABLE_NAME, "Start, End, Length")
-            self.graph = nd.build_graph(self.list_all)
-
-    def update_points(self, *args) -> None:
-        with nd.Database(self.cursor.PATH.get()) as db:
-            if self.cursor.PATH.get() == str():
-                self.paths_menu.entryconfig(0, state=DISABLED)
-                self.paths_menu.entryconfig(1, state=DISABLED)
-            else:
-                self.paths_menu.entryconfig(0, state="normal")
-                self.paths_menu.entryconfig(1, state="normal")
-                self.init_graph()
-                self.start_point["values"] = [key for key in self.graph.keys()]
-
-    def update_end_point(self, arg):
-        self.dist, self.precedent = nd.dijkstra(
-            self.graph, self.start_point.get(), self.list_all
-        )
-        self.end_point["values"] = [
-            node
-            for node in self.dist.keys()
-            if self.dist[node] < 999 and self.dist[node] != 0
-        ]
-
-    def find_path(self) -> None:
-        start = self.start_point.get()
-        end = self.end_point.get()
-        start_values = self.start_point["values"]
-        end_values = self.end_point["values"]
-        if start not in start_values or start == "":
-            showerror(
-                title="Error!",
-                message="The start point is not in the database!",
-            )
-        elif end not in end_values or end == "":
-            showerror(
-                title="Error!",
-                message="The end point is not in the database!",
-            )
+    if delimiter is None:
+        delimiter = "\t" if fname.endswith(".tsv") else ","
+    file = sys.stdin if fname == "-" else open(fname, encoding="utf-8", newline="")
+    try:
+        for number, row in enumerate(csv.reader(file, delimiter=delimiter), 1):
+            if not row:
+                continue
+            if len(row) < 2:
+                print(f"line {number}: expected a start and an end", file=sys.stderr)
+                continue
+            yield row[0].strip(), row[1].strip()
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def engines_(db: nd.Database, engine: str) -> list:
+    """
+    Function to load the up to date data of a search engine
+    @param engine auto, hierarchy, astar or bidirectional
+    @returns [hierarchy, landmarks], None when not loaded
+    """
+    hierarchy = landmarks = None
+    if engine in ("auto", "hierarchy"):
+        hierarchy = nd.ContractionHierarchy.load(db)
+    if engine in ("auto", "astar") and hierarchy is None:
+        landmarks = nd.Landmarks.load(db)
+    if engine in ("hierarchy", "astar") and hierarchy is landmarks is None:
+        print(f"no up to date {engine} data found", file=sys.stderr)
+    return [hierarchy, landmarks]
+
+
+def query(args) -> None:
+    if args.stats:
+        nd.stats.enable()
+    with nd.Database(args.database) as db:
+        struct = nd.structure_of(db)
+        if args.lazy:
+            nd.LazyGraph.ensure_indexes(db, struct)
+            graph = nd.LazyGraph(db, struct, args.cache_size)
         else:
-            shortest_path = nd.find_shortest_path(start, end, self.precedent)
-            if shortest_path is None:
-                showerror(
-                    title="Error!",
-                    message="There is no path between the two points!",
-                )
+            graph = nd.load_snapshot(db, struct=struct)
+        reverse = nd.build_reverse_graph(graph)
+        hierarchy, landmarks = engines_(db, args.engine)
+        search, cache = nd.shortest_path, None
+        if args.cache:
+            cache = nd.RouteCache(db, args.cache)
+            search = cache.route
+
+        if args.format == "csv":
+            writer = csv.writer(sys.stdout, lineterminator="\n")
+            writer.writerow(("start", "end", "length", "path"))
+        for start, end in read_pairs(args.pairs, args.delimiter):
+            distance, path = search(graph, reverse, start, end, hierarchy, landmarks)
+            if path is not None:
+                path.reverse()
+            if args.format == "csv":
+                writer.writerow((start, end, distance, ">".join(path or ())))
             else:
-                shortest_path.reverse()
-                showinfo(
-                    title="Path found!",
-                    message=f"The shortest path between {start} and {end} is:\n{shortest_path}\n and is {self.dist[end]} long",
+                print(
+                    json.dumps(
+                        {"start": start, "end": end, "length": distance, "path": path}
+                    )
                 )
+        if cache is not None:
+            cache.flush()
+    if args.stats:
+        print(nd.stats.report(), file=sys.stderr)
+
+
+def warm(args) -> None:
+    with nd.Database(args.database) as db:
+        struct = nd.structure_of(db)
+        graph = nd.load_snapshot(db, struct=struct)
+        reverse = nd.build_reverse_graph(graph)
+        hierarchy, landmarks = engines_(db, args.engine)
+        cache = nd.RouteCache(db, args.maxsize)
+        count = cache.warm(graph, reverse, args.count, hierarchy, landmarks)
+    print(f"{count} routes searched", file=sys.stderr)
+
+
+def reach(args) -> None:
+    with nd.Database(args.database) as db:
+        graph = nd.load_snapshot(db)
+    if args.start not in graph.ids:
+        print(f"{args.start} is not in {args.database}", file=sys.stderr)
+        return
+    if args.format == "csv":
+        writer = csv.writer(sys.stdout, lineterminator="\n")
+        writer.writerow(("node", "length", "precedent"))
+    for node, distance, precedent in nd.bounded_dijkstra(
+        graph, args.start, args.radius, args.count
+    ):
+        if args.format == "csv":
+            writer.writerow((node, distance, precedent or ""))
+        else:
+            print(
+                json.dumps({"node": node, "length": distance, "precedent": precedent})
+            )
 
-    def create_file(self) -> None:
-        filetypes = (("PATH", f"*{self.cursor.TYPE}"),)
-        filename = sname(
-            title="Create a file",
-            initialdir=self.cursor.DIR,
-            filetypes=filetypes,
-        )
-        if filename != "":
-            filename = filename.strip(".db")
-            with nd.Database(filename + self.cursor.TYPE) as db:
-                db.create_table(
-                    table=self.struct.TABLE_NAME, columns=self.struct.COLUMNS
-                )
-                showinfo(
-                    title="File successfully created!",
-                    message=f"{filename}{self.cursor.TYPE} has been created!",
-                )
-                self.cursor.PATH.set(filename + self.cursor.TYPE)
-
-    def open_file(self) -> None:
-        filetypes = (("PATH", self.cursor.TYPE),)
-        filename = fname(
-            title="Open a file",
-            initialdir=self.cursor.DIR,
-            filetypes=filetypes,
-        )
-        self.cursor.PATH.set(filename)
-        self.update_points()
-
-    def __init__(self, **kwargs):
-        Tk.__init__(self, **kwargs)
-        self.title("Odyssee pathfinder")
-        self.geometry("300x300")
-        self.resizable(0, 0)
-        self.frame = Frame(self, bg="#f25252")
-        self.frame.pack()
-        self.main_menu = Menu(self.frame)
-        self.config(menu=self.main_menu, bg="#f25252")
-        self.cursor = File(StringVar())
-        self.struct = DatabaseStructure()
-        self.cursor.PATH.trace_add("write", self.update_points)
-        self.graph: dict[str, dict[str, int]] = dict()
-        self.dist: dict[str, int] = dict()
-        self.precedent: dict[str, str] = dict()
-        self.list_all: list[tuple[str, str, int]] = list()
-
-        self.file_menu = Menu(self.main_menu, tearoff=0)
-        self.file_menu.add_command(label="Create a file", command=self.create_file)
-        self.file_menu.add_command(label="Open a file", command=self.open_file)
-        self.file_menu.add_command(label="View...")
-
-        self.paths_menu = Menu(self.main_menu, tearoff=0)
-        self.paths_menu.add_command(
-            label="Add a path...", command=lambda: AddPathWindow(self), state=DISABLED
-        )
-        self.paths_menu.add_command(
-            label="Remove a path...",
-            command=lambda: DeletePathWindow(self),
-            state=DISABLED,
-        )
 
-        self.question_mark_menu = Menu(self.main_menu, tearoff=0)
-        self.question_mark_menu.add_command(label="Help!")
-        self.question_mark_menu.add_command(label="About us...")
+def main() -> None:
+    parser = ArgumentParser(
+        prog="odyssee_pathfinder",
+        description="A small app that shall help you find your path",
+    )
+    commands = parser.add_subparsers(dest="command")
 
-        self.main_menu.add_cascade(label="File", menu=self.file_menu)
-        self.main_menu.add_cascade(label="Paths", menu=self.paths_menu)
-        self.main_menu.add_cascade(label="?", menu=self.question_mark_menu)
+    matrix_parser = commands.add_parser(
+        "matrix", help="compute a many-to-many distance matrix"
+    )
+    matrix_parser.add_argument("database", help="the .db file to read the paths from")
+    matrix_parser.add_argument("--sources", help="file of starting nodes, one per line")
+    matrix_parser.add_argument("--targets", help="file of ending nodes, one per line")
+    matrix_parser.add_argument("--workers", type=int, help="number of processes")
+    matrix_parser.add_argument(
+        "--output", help="the .db file to write to, the input one by default"
+    )
+    matrix_parser.add_argument("--table", default=nd.matrix.TABLE_NAME)
+    matrix_parser.add_argument(
+        "--csv",
+        help="a CSV file to write to instead of a table, - for the standard output",
+    )
+    matrix_parser.add_argument("--batch-size", type=int, default=10000)
+    matrix_parser.set_defaults(func=matrix)
 
-        self.start_label = Label(self.frame, text="Starting Node", width=44)
-        self.start_point = BetterAutocompleteCombobox(self.frame, width=48)
+    import_parser = commands.add_parser(
+        "import", help="import a CSV/TSV edge list of start, end, length"
+    )
+    import_parser.add_argument("database", help="the .db file to import into")
+    import_parser.add_argument("file", help="the edge list, - for the standard input")
+    import_parser.add_argument(
+        "--delimiter", help="the column delimiter, from the file extension by default"
+    )
+    import_parser.add_argument(
+        "--header", action="store_true", help="skip the first line of the file"
+    )
+    import_parser.add_argument("--batch-size", type=int, default=50000)
+    import_parser.add_argument(
+        "--cache-size", type=int, default=256, help="page cache size in MiB"
+    )
+    import_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="store the paths with integer keys, migrating the database if needed",
+    )
+    import_parser.set_defaults(func=import_)
 
-        self.end_label = Label(self.frame, text="Ending Node", width="44")
-        self.end_point = BetterAutocompleteCombobox(self.frame, width=48)
+    migrate_parser = commands.add_parser(
+        "migrate", help="convert the paths of a database to integer keys"
+    )
+    migrate_parser.add_argument("database", help="the .db file to migrate")
+    migrate_parser.add_argument(
+        "--keep", action="store_true", help="keep the old table as Paths_V1"
+    )
+    migrate_parser.set_defaults(func=migrate)
 
-        self.button = Button(
-            self.frame, text="Find shortest path !", command=self.find_path
-        )
-        self.start_point.bind("<<ComboboxSelected>>", self.update_end_point)
-
-        self.start_label.pack()
-        self.start_point.pack()
-        self.end_label.pack()
-        self.end_point.pack()
-        self.button.pack()
-
-
-class Window(Toplevel):
-    def __init__(self, master: MainWindow = None, **kwargs) -> None:
-        Toplevel.__init__(self, master, **kwargs)
-        self.geometry("300x300")
-        self.resizable(0, 0)
-        self.config(bg="#f25252")
-        self.frame = Frame(self, bg="#f25252")
-        self.frame.pack(expand=True)
-        self.grab_set()
-
-        def handler():
-            self.master.update_points()
-            self.destroy()
-
-        self.protocol("WM_DELETE_WINDOW", handler)
-
-
-class AddPathWindow(Window):
-    def __init__(self, master: MainWindow = None, **kwargs) -> None:
-        super().__init__(master, **kwargs)
-        self.title("Add a path...")
-        self.construct_body()
-        self.master = master
-
-    def update_combo(
-        self,
-    ) -> None:
-        self.master.update_points()
-        tmp = dict()
-        for i in self.master.list_all:
-            tmp[i[0]] = 1
-            tmp[i[1]] = 1
-        self.start_combo["values"] = [key for key in tmp]
-
-    def update_end_combo(self, event) -> None:
-        self.end_combo["values"] = [
-            key for key in self.start_combo["values"] if key != self.start_combo.get()
-        ]
-
-    def add_path(self) -> None:
-        starting_node = self.start_combo.get().strip()
-        ending_node = self.end_combo.get().strip()
-        length = self.length_entry.get().strip()
-        if starting_node and ending_node and length:
-            if starting_node == ending_node:
-                showinfo(
-                    title="Error",
-                    message="Starting and ending node cannot be the same!",
-                )
-            else:
-                with nd.Database(self.master.cursor.PATH.get()) as db:
-                    try:
-                        if self.check_var.get() == 1:
-                            sep = "<-"
-                            ID = id_generator(ending_node + starting_node)
-                            db.write(
-                                self.master.struct.TABLE_NAME,
-                                self.master.struct.COLUMNS_NAMES,
-                                [
-                                    ID,
-                                    ending_node,
-                                    starting_node,
-                                    length,
-                                ],
-                            )
-                        else:
-                            sep = "-"
-                        ID = id_generator(starting_node + ending_node)
-                        db.write(
-                            self.master.struct.TABLE_NAME,
-                            self.master.struct.COLUMNS_NAMES,
-                            [
-                                ID,
-                                starting_node,
-                                ending_node,
-                                length,
-                            ],
-                        )
-
-                        showinfo(
-                            title="Path successfully added!",
-                            message=f"{starting_node}{sep}{length}->{ending_node} has been added!",
-                        )
-                    except IE:
-                        showinfo(
-                            title="Path already exists!",
-                            message=f"{starting_node}{sep}{length}->{ending_node} already exists!",
-                        )
-                self.update_combo()
-        else:
-            showerror(
-                title="Incomplete entry!",
-                message="Make sure to submit every argument...",
-            )
+    export_parser = commands.add_parser(
+        "export", help="export a table to a CSV file without loading it"
+    )
+    export_parser.add_argument("database", help="the .db file to export from")
+    export_parser.add_argument("table", help="the table to export, e.g. Paths")
+    export_parser.add_argument("output", help="the CSV file, - for the standard output")
+    export_parser.add_argument(
+        "--columns", default="*", help="comma-separated columns to export"
+    )
+    export_parser.add_argument("--where", help="an SQL condition on the rows")
+    export_parser.add_argument("--order", help="an SQL ORDER BY clause")
+    export_parser.add_argument("--batch-size", type=int, default=10000)
+    export_parser.set_defaults(func=export)
+
+    query_parser = commands.add_parser(
+        "query", help="find the shortest paths of start, end pairs without the GUI"
+    )
+    query_parser.add_argument("database", help="the .db file to read the paths from")
+    query_parser.add_argument(
+        "pairs",
+        nargs="?",
+        default="-",
+        help="file of start, end pairs, the standard input by default",
+    )
+    query_parser.add_argument(
+        "--delimiter", help="the column delimiter, from the file extension by default"
+    )
+    query_parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    query_parser.add_argument(
+        "--engine",
+        choices=("auto", "hierarchy", "astar", "bidirectional"),
+        default="auto",
+        help="the search engine, the fastest one available by default",
+    )
+    query_parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="read the paths from the database on demand instead of the snapshot",
+    )
+    query_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=100000,
+        help="number of nodes cached with --lazy",
+    )
+    query_parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print the search and database statistics to the standard error",
+    )
+    query_parser.add_argument(
+        "--cache",
+        type=int,
+        metavar="SIZE",
+        help="read and store the paths in a route cache of at most SIZE routes",
+    )
+    query_parser.set_defaults(func=query)
 
-    def construct_body(self) -> None:
+    warm_parser = commands.add_parser(
+        "warm", help="search again the most requested routes of the route cache"
+    )
+    warm_parser.add_argument("database", help="the .db file to read the paths from")
+    warm_parser.add_argument(
+        "--count", type=int, default=100, help="number of most requested routes"
+    )
+    warm_parser.add_argument(
+        "--maxsize", type=int, default=10000, help="maximum number of cached routes"
+    )
+    warm_parser.add_argument(
+        "--engine",
+        choices=("auto", "hierarchy", "astar", "bidirectional"),
+        default="auto",
+        help="the search engine, the fastest one available by default",
+    )
+    warm_parser.set_defaults(func=warm)
 
-        self.check_var = IntVar()
-        self.check_button = Checkbutton(
-            self.frame,
-            text="Two-way",
-            variable=self.check_var,
-            onvalue=1,
-            offvalue=0,
-        )
-        self.check_button.pack()
-        self.start_label = Label(self.frame, text="Starting node", width=44)
-        self.start_combo = BetterAutocompleteCombobox(self.frame, width=48)
-        self.start_label.pack()
-        self.start_combo.pack()
-
-        self.end_label = Label(self.frame, text="Ending node", width=44)
-        self.end_combo = BetterAutocompleteCombobox(self.frame, width=48)
-        self.end_label.pack()
-        self.end_combo.pack()
-        self.update_combo()
-        self.start_combo.bind("<<ComboboxSelected>>", self.update_end_combo)
-
-        self.length_label = Label(self.frame, text="Length", width=44)
-        self.length_entry = OnlyIntEntry(self.frame, width=50)
-        self.length_label.pack()
-        self.length_entry.pack()
-
-        self.submit = Button(self.frame, text="Submit!", command=self.add_path)
-        self.submit.pack()
-
-
-class DeletePathWindow(Window):
-    def __init__(self, master: MainWindow = None, **kwargs) -> None:
-        super().__init__(master, **kwargs)
-        self.geometry("300x300")
-        self.title("Remove a path...")
-        self.construct_body()
-        self.master = master
-
-    @staticmethod
-    def graph_to_list(graph) -> None:
-        list_graph = []
-        for node in graph:
-            for neighbours in graph[node].items():
-                list_graph.append(f"{node}-{neighbours[1]}->{neighbours[0]}")
-        return list_graph
-
-    def update_combo(
-        self,
-    ) -> None:
-        self.master.update_points()
-        self.combo["values"] = self.graph_to_list(self.master.graph)
-
-    def delete_path(self) -> None:
-        start = self.combo.get().strip()
-        start, end = start.split("->")
-        start, length = start.split("-")
-        print(start, end, length)
-
-        with nd.Database(self.master.cursor.PATH.get()) as db:
-            db.delete_rows(
-                self.master.struct.TABLE_NAME, f"ID = {id_generator(start + end)} "
-            )
-            showinfo(
-                title="Path successfully deleted!",
-                message=f"{start}-{length}->{end} has been deleted!",
-            )
-        self.update_combo()
+    reach_parser = commands.add_parser(
+        "reach", help="list the nodes reachable from a node, the nearest first"
+    )
+    reach_parser.add_argument("database", help="the .db file to read the paths from")
+    reach_parser.add_argument("start", help="the starting node")
+    reach_parser.add_argument(
+        "--radius", type=int, help="only the nodes at most this far from the start"
+    )
+    reach_parser.add_argument("--count", type=int, help="only the nearest nodes")
+    reach_parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    reach_parser.set_defaults(func=reach)
 
-    def construct_body(self) -> None:
-        self.label = Label(self.frame, text="Nodes", width=44)
-        self.combo = BetterAutocompleteCombobox(self.frame, width=48)
-        self.button = Button(self.frame, text="Delete", command=self.delete_path)
-        self.label.pack()
-        self.combo.pack()
-        self.button.pack()
+    args = parser.parse_args()
+    if args.command is None:
+        # tkinter and ttkwidgets are only needed, and imported, for the GUI
+        from gui import MainWindow
 
-        self.update_combo()
+        root = MainWindow()
+        root.mainloop()
+        nd.connections.close()
+    else:
+        args.func(args)
 
 
 if __name__ == "__main__":
-    root = MainWindow()
-    root.mainloop()
+    main()
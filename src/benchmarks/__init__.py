@@ -0,0 +1,2 @@
+from .generators import GENERATORS, chain, geometric, grid, scale_free
+from .runner import compare, load_results, run, save_results
@@ -0,0 +1,69 @@
+""" Command line of the benchmarks, run from the src directory with python -m benchmarks"""
+from argparse import ArgumentParser
+import sys
+from .generators import GENERATORS
+from .runner import SIZES, compare, load_results, run, save_results
+
+
+def main() -> None:
+    parser = ArgumentParser(
+        prog="benchmarks",
+        description="Benchmarks of the graph searches and of the database",
+    )
+    parser.add_argument(
+        "--sizes",
+        default="small",
+        help=f"one of {', '.join(SIZES)} or comma-separated numbers of nodes",
+    )
+    parser.add_argument(
+        "--generators",
+        default=",".join(GENERATORS),
+        help="comma-separated generators of graphs",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="the JSON file to save the results to")
+    parser.add_argument("--baseline", help="a JSON file of results to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="the relative slowdown reported as a regression",
+    )
+    args = parser.parse_args()
+
+    sizes = SIZES.get(args.sizes) or tuple(int(size) for size in args.sizes.split(","))
+    generators = args.generators.split(",")
+    unknown = [name for name in generators if name not in GENERATORS]
+    if unknown:
+        parser.error(f"unknown generators: {', '.join(unknown)}")
+
+    def progress(key: str, result: dict) -> None:
+        settled = "-" if result["settled"] is None else result["settled"]
+        print(
+            f"{key:<45} {result['seconds'] * 1000:>10.2f} ms "
+            f"{result['peak_kib']:>12.1f} KiB {settled:>8}"
+        )
+
+    print(f"{'operation':<45} {'time':>13} {'peak memory':>16} {'settled':>8}")
+    results = run(sizes, generators, args.repeat, args.seed, progress)
+    if args.output:
+        save_results(results, args.output)
+    if args.baseline:
+        regressions = 0
+        print()
+        for key, old, new, ratio, regression in compare(
+            results, load_results(args.baseline), args.threshold
+        ):
+            regressions += regression
+            print(
+                f"{key:<45} {old * 1000:>10.2f} -> {new * 1000:>10.2f} ms "
+                f"{ratio:>6.2f}x{' REGRESSION' if regression else ''}"
+            )
+        if regressions:
+            print(f"{regressions} regressions", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+""" Seeded generators of synthetic graphs, as lists of edges [start, end, length]"""
+import math
+import random
+
+
+def grid(nodes: int, seed: int = 0) -> list[list]:
+    """Function to generate a square grid of about nodes nodes, every node
+    being linked both ways to its right and lower neighbours
+
+    @param nodes The approximate number of nodes.
+
+    @param seed The seed of the random lengths."""
+    rng = random.Random(seed)
+    side = max(2, math.isqrt(nodes))
+    edges = []
+    for row in range(side):
+        for column in range(side):
+            for other in (row, column + 1), (row + 1, column):
+                if other[0] < side and other[1] < side:
+                    lenght = rng.randint(1, 9)
+                    edges.append([f"{row},{column}", f"{other[0]},{other[1]}", lenght])
+                    edges.append([f"{other[0]},{other[1]}", f"{row},{column}", lenght])
+    return edges
+
+
+def geometric(nodes: int, seed: int = 0, degree: int = 6) -> list[list]:
+    """Function to generate a random geometric graph: nodes are random points
+    of the unit square, linked both ways when they are close enough to have
+    about degree neighbours on average, the length being their distance
+
+    @param nodes The number of nodes.
+
+    @param seed The seed of the random points.
+
+    @param degree The average number of neighbours of a node."""
+    rng = random.Random(seed)
+    radius = math.sqrt(degree / (math.pi * nodes))
+    points = [(rng.random(), rng.random()) for _ in range(nodes)]
+    cells = {}
+    for node, (x, y) in enumerate(points):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(node)
+    edges = []
+    for node, (x, y) in enumerate(points):
+        cell_x, cell_y = int(x / radius), int(y / radius)
+        for dx in -1, 0, 1:
+            for dy in -1, 0, 1:
+                for other in cells.get((cell_x + dx, cell_y + dy), ()):
+                    if other == node:
+                        continue
+                    distance = math.dist(points[node], points[other])
+                    if distance <= radius:
+                        lenght = max(1, round(10 * distance / radius))
+                        edges.append([f"P{node}", f"P{other}", lenght])
+    return edges
+
+
+def scale_free(nodes: int, seed: int = 0, links: int = 3) -> list[list]:
+    """Function to generate a scale-free graph with the Barabasi-Albert
+    preferential attachment, every new node being linked both ways to links
+    existing nodes chosen in proportion to their degree
+
+    @param nodes The number of nodes.
+
+    @param seed The seed of the random choices.
+
+    @param links The number of links of every new node."""
+    rng = random.Random(seed)
+    # Every node appears once per link, so a uniform choice follows the degree
+    targets = list(range(links))
+    edges = []
+    for node in range(links, nodes):
+        chosen = set()
+        while len(chosen) < links:
+            chosen.add(rng.choice(targets))
+        for other in chosen:
+            lenght = rng.randint(1, 9)
+            edges.append([f"S{node}", f"S{other}", lenght])
+            edges.append([f"S{other}", f"S{node}", lenght])
+            targets.extend((node, other))
+    return edges
+
+
+def chain(nodes: int, seed: int = 0) -> list[list]:
+    """Function to generate a long one-way chain of nodes, the worst case of
+    the depth of a shortest path tree
+
+    @param nodes The number of nodes.
+
+    @param seed The seed of the random lengths."""
+    rng = random.Random(seed)
+    return [
+        [f"C{node}", f"C{node + 1}", rng.randint(1, 3)] for node in range(nodes - 1)
+    ]
+
+
+GENERATORS = {
+    "grid": grid,
+    "geometric": geometric,
+    "scale_free": scale_free,
+    "chain": chain,
+}
@@ -0,0 +1,202 @@
+""" Runner of the benchmarks, recording the wall time, the peak memory and
+the number of settled nodes of every operation"""
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import nodes as nd
+from .generators import GENERATORS
+
+SIZES = {
+    "small": (1000,),
+    "medium": (1000, 10000),
+    "large": (1000, 10000, 100000),
+}
+
+
+class CountingGraph:
+    """A graph counting the adjacency lookups made by a search, one per settled node"""
+
+    def __init__(self, graph: dict[str, dict[str, int]], counter: list[int]) -> None:
+        self.graph = graph
+        self.counter = counter
+
+    def get(self, name: str, default=None) -> dict[str, int]:
+        self.counter[0] += 1
+        return self.graph.get(name, default)
+
+    def __getattr__(self, name: str):
+        return getattr(self.graph, name)
+
+
+def measure(operation, repeat: int = 3) -> dict[str, float]:
+    """Function to measure an operation, called with the function wrapping the
+    graphs it searches.
+
+    The wall time is the best of repeat runs. The peak memory is measured by
+    one more run under tracemalloc, and the settled nodes by one run on
+    CountingGraph, so neither slows down the timed runs.
+
+    @returns {"seconds": ..., "peak_kib": ..., "settled": ...}, settled being
+    None for an operation which searches no graph."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation(lambda graph: graph)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        operation(lambda graph: graph)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    counter = [0]
+    wrapped = []
+
+    def wrap(graph):
+        wrapped.append(graph)
+        return CountingGraph(graph, counter)
+
+    operation(wrap)
+    return {
+        "seconds": min(times),
+        "peak_kib": round(peak / 1024, 1),
+        "settled": counter[0] if wrapped else None,
+    }
+
+
+def operations_(edges: list[list], directory: str):
+    """Generator of the (name, operation) benchmarked on a list of edges"""
+    graph = nd.build_graph(edges)
+    reverse = nd.build_reverse_graph(graph)
+    csr = nd.CSRGraph.from_edges(edges)
+    source = edges[0][0]
+    dist, precedent = nd.dijkstra(graph, source)
+    target = max(dist, key=lambda node: (dist[node], node))
+    struct = nd.DatabaseStructure()
+    columns = ("Start", "End", "Length")
+
+    yield "build_graph", lambda wrap: nd.build_graph(edges)
+    yield "build_reverse_graph", lambda wrap: nd.build_reverse_graph(graph)
+    yield "csr_from_edges", lambda wrap: nd.CSRGraph.from_edges(edges)
+    yield "dijkstra", lambda wrap: nd.dijkstra(wrap(graph), source)
+    yield "dijkstra_csr", lambda wrap: nd.dijkstra(csr, source)
+    yield "dijkstra_target", lambda wrap: nd.dijkstra(
+        wrap(graph), source, target=target
+    )
+    yield "bidirectional_dijkstra", lambda wrap: nd.bidirectional_dijkstra(
+        wrap(graph), wrap(reverse), source, target
+    )
+    yield "bounded_dijkstra_radius", lambda wrap: list(
+        nd.bounded_dijkstra(wrap(graph), source, radius=dist[target] // 4)
+    )
+    yield "bounded_dijkstra_count", lambda wrap: list(
+        nd.bounded_dijkstra(wrap(graph), source, count=100)
+    )
+    yield "find_shortest_path", lambda wrap: nd.find_shortest_path(
+        source, target, precedent
+    )
+
+    with nd.Database(os.path.join(directory, "benchmark.db")) as db:
+
+        def write(wrap):
+            db.remove_table(struct.TABLE_NAME)
+            db.create_table(struct.TABLE_NAME, struct.COLUMNS[1:])
+            with db.transaction():
+                for edge in edges[:1000]:
+                    db.write(struct.TABLE_NAME, columns, edge)
+
+        def write_many(wrap):
+            db.remove_table(struct.TABLE_NAME)
+            db.create_table(struct.TABLE_NAME, struct.COLUMNS[1:])
+            db.write_many(struct.TABLE_NAME, columns, edges)
+
+        yield "database_write_1000", write
+        yield "database_write_many", write_many
+        yield "database_get", lambda wrap: db.get(struct.TABLE_NAME, ", ".join(columns))
+        yield "database_get_limit", lambda wrap: db.get(
+            struct.TABLE_NAME, ", ".join(columns), 100
+        )
+    nd.connections.close(os.path.join(directory, "benchmark.db"))
+
+
+def run(
+    sizes: tuple[int] = SIZES["small"],
+    generators: list[str] = None,
+    repeat: int = 3,
+    seed: int = 0,
+    progress=None,
+) -> dict:
+    """Function to run every benchmark on every generated graph.
+
+    @param sizes The numbers of nodes of the generated graphs.
+
+    @param generators Optionally, the names of the GENERATORS to use, all by default.
+
+    @param repeat The number of timed runs of every operation.
+
+    @param seed The seed of the generators, the same seed giving the same graphs.
+
+    @param progress Optionally, a function called with the key and the result of every
+    operation.
+
+    @returns {"meta": {...}, "results": {"grid-1000/dijkstra": {...}, ...}}"""
+    results = {}
+    for name in generators or GENERATORS:
+        for size in sizes:
+            edges = GENERATORS[name](size, seed)
+            with tempfile.TemporaryDirectory() as directory:
+                for operation, function in operations_(edges, directory):
+                    key = f"{name}-{size}/{operation}"
+                    results[key] = measure(function, repeat)
+                    if progress is not None:
+                        progress(key, results[key])
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def save_results(results: dict, fname: str) -> None:
+    """Function to save the results of run() to a JSON file"""
+    with open(fname, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(fname: str) -> dict:
+    """Function to load results saved by save_results()"""
+    with open(fname, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float = 0.1, resolution: float = 1e-4
+) -> list[tuple[str, float, float, float, bool]]:
+    """Function to compare the wall times of two results of run().
+
+    @param threshold The relative slowdown beyond which a time is a regression.
+
+    @param resolution The absolute slowdown in seconds under which a time is
+    never a regression, the shortest operations being mostly noise.
+
+    @returns A list of (key, baseline seconds, seconds, ratio, regression) for
+    every key present in both results."""
+    rows = []
+    for key, result in results["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        ratio = result["seconds"] / max(old["seconds"], 1e-9)
+        regression = (
+            ratio > 1 + threshold and result["seconds"] - old["seconds"] > resolution
+        )
+        rows.append((key, old["seconds"], result["seconds"], ratio, regression))
+    return rows
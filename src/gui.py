@@ -0,0 +1,790 @@
+""" The Tk interface of the pathfinder, only imported to start it"""
+from tkinter.filedialog import askopenfilename as fname, asksaveasfilename as sname
+from tkinter.messagebox import showinfo, showerror
+from tkinter.ttk import Combobox, Progressbar
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain
+from queue import Empty, Queue
+from threading import Event
+from tkinter import (
+    DISABLED,
+    Button,
+    Checkbutton,
+    Entry,
+    Label,
+    Listbox,
+    Toplevel,
+    StringVar,
+    Frame,
+    Tk,
+    Menu,
+    IntVar,
+)
+from sqlite3 import IntegrityError as IE
+from ttkwidgets.autocomplete import AutocompleteCombobox
+import nodes as nd
+
+
+@dataclass(slots=True)
+class File:
+    PATH: StringVar = field(repr=False)
+    DIR: str = field(default="./", init=False, repr=False)
+    TYPE: str = field(default=".db", init=False, repr=False)
+
+
+class BetterAutocompleteCombobox(AutocompleteCombobox):
+    def __init__(self, master=None, completevalues=None, **kwargs):
+        super().__init__(master, completevalues, **kwargs)
+
+    def get_val(self):
+        result = self.get()
+        self.set(str())
+        return result
+
+
+class IndexedCombobox(BetterAutocompleteCombobox):
+    """A combobox listing only the top matches of a NameIndex for the typed
+    text, so that no keystroke lists or scans every node of a large map"""
+
+    def __init__(self, master=None, limit: int = 50, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self.index = nd.NameIndex()
+        self.accept = None
+        self.within = None
+        self.limit = limit
+
+    def set_index(self, index: nd.NameIndex, accept=None, within=None) -> None:
+        """Function to set the names to search and optionally a filter on them
+        and the collection of the names they are restricted to"""
+        self.index, self.accept, self.within = index, accept, within
+        self.update_values()
+
+    def update_values(self) -> None:
+        self["values"] = self.index.search(
+            Combobox.get(self), self.limit, self.accept, self.within
+        )
+
+    def valid(self, name: str) -> bool:
+        """Function to tell whether a name is one the combobox may list"""
+        return (
+            name in self.index
+            and (self.within is None or name in self.within)
+            and (self.accept is None or bool(self.accept(name)))
+        )
+
+    def handle_keyrelease(self, event) -> None:
+        if event.keysym not in ("Up", "Down", "Return", "Escape", "Tab"):
+            self.update_values()
+
+
+class BetterEntry(Entry):
+    def __init__(self, master=None, **kwargs) -> None:
+        self.var = StringVar()
+        Entry.__init__(self, master, textvariable=self.var, **kwargs)
+
+    def get(self) -> str:
+        result = super().get()
+        self.var.set(str())
+        return result
+
+
+class OnlyIntEntry(BetterEntry):
+    def __init__(self, master=None, **kwargs) -> None:
+        BetterEntry.__init__(self, master, **kwargs)
+        self.old_value = ""
+        self.var.trace("w", self.check)
+
+    def check(self, *args) -> None:
+        if self.var.get().isdigit() or self.var.get() == "":
+            # the current value is only digits; allow this
+            self.old_value = self.var.get()
+        else:
+            # there's non-digit characters in the input; reject this
+            self.var.set(self.old_value)
+
+
+class Worker:
+    """Runs the slow tasks of a window, loading a graph or searching it, on a
+    background thread so that the Tk main loop stays responsive.
+
+    Tasks are grouped by kind. Submitting a task cancels the previous task of
+    the same kind and only the result of the latest one is delivered. The
+    results come back through a queue polled with after(), as only the main
+    thread may touch the widgets."""
+
+    def __init__(self, master: Tk, progress: Progressbar, interval: int = 50) -> None:
+        """The constructor of the Worker class
+
+        @param master The window whose main loop polls the results.
+
+        @param progress The progress bar animated while a task is pending.
+
+        @param interval The polling interval in milliseconds."""
+        self.master = master
+        self.progress = progress
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.results = Queue()
+        self.latest: dict[str, tuple[int, Event]] = dict()
+        self.generation = 0
+        self.pending = 0
+
+    def submit(self, kind: str, task, callback) -> None:
+        """Function to run a task in the background
+
+        @param kind The kind of the task, the previous task of this kind is cancelled.
+
+        @param task The function to run, given an Event set when the task is cancelled.
+
+        @param callback The function called on the main thread with the result."""
+        self.cancel(kind)
+        self.generation += 1
+        generation, cancel = self.generation, Event()
+        self.latest[kind] = (generation, cancel)
+
+        def run() -> None:
+            result, error = None, None
+            if not cancel.is_set():
+                try:
+                    result = task(cancel)
+                except Exception as exception:
+                    error = exception
+            self.results.put((kind, generation, callback, result, error))
+
+        self.executor.submit(run)
+        if not self.pending:
+            self.progress.start()
+            self.master.after(self.interval, self.poll)
+        self.pending += 1
+
+    def cancel(self, kind: str = None) -> bool:
+        """Function to cancel the pending task of a kind, or every pending task
+
+        @returns Whether a task was cancelled."""
+        cancelled = [key for key in self.latest if kind is None or key == kind]
+        for key in cancelled:
+            self.latest.pop(key)[1].set()
+        return bool(cancelled)
+
+    def poll(self) -> None:
+        """Function to deliver the results of the finished tasks"""
+        while True:
+            try:
+                kind, generation, callback, result, error = self.results.get_nowait()
+            except Empty:
+                break
+            self.pending -= 1
+            if self.latest.get(kind, (None,))[0] != generation:
+                continue
+            del self.latest[kind]
+            if error is not None:
+                showerror(title="Error!", message=str(error))
+            else:
+                callback(result)
+        if self.pending:
+            self.master.after(self.interval, self.poll)
+        else:
+            self.progress.stop()
+
+    def shutdown(self, final=None) -> None:
+        """Function to cancel every task and stop the thread
+
+        @param final Optionally, a function run on the thread once the tasks
+        returned, before its connections are closed."""
+        self.cancel()
+        # The cancelled tasks return at once, then the connections opened by
+        # the thread are closed on the thread itself
+        if final is not None:
+            self.executor.submit(final)
+        self.executor.submit(nd.connections.close)
+        self.executor.shutdown(wait=False)
+
+
+class MainWindow(Tk):
+    def init_graph(self) -> None:
+        # The file may have changed since it was loaded, even if it is the same one
+        self.tree_cache.bump()
+        self.worker.cancel()
+        self.graph, self.reverse = dict(), dict()
+        self.nodes = nd.NameIndex()
+        self.landmarks, self.hierarchy = None, None
+        if self.route_cache is not None:
+            # The hits read from the previous file are written on the thread
+            # owning its connection
+            route_cache, self.route_cache = self.route_cache, None
+            self.worker.submit(
+                "flush", lambda cancel: route_cache.flush(), lambda result: None
+            )
+        self.dist, self.precedent = dict(), dict()
+        self.current_start = str()
+        self.refresh_points()
+        path = self.cursor.PATH.get()
+        self.worker.submit(
+            "graph", lambda cancel: self.load_graph(path), self.graph_loaded
+        )
+
+    def load_graph(self, path: str) -> list:
+        with nd.Database(path) as db:
+            graph = nd.load_snapshot(db)
+            reverse = nd.build_reverse_graph(graph)
+            landmarks = nd.Landmarks.load(db)
+            hierarchy = nd.ContractionHierarchy.load(db)
+        nodes = nd.NameIndex(chain(graph.keys(), reverse.keys()))
+        # The cache is kept for the searches of the file, which all run on the
+        # worker thread and so share its pooled connection
+        route_cache = nd.RouteCache(nd.Database(path))
+        return [graph, reverse, nodes, landmarks, hierarchy, route_cache]
+
+    def graph_loaded(self, result: list) -> None:
+        self.graph, self.reverse, self.nodes, self.landmarks = result[:4]
+        self.hierarchy, self.route_cache = result[4:]
+        self.refresh_points()
+
+    def update_points(self, *args) -> None:
+        if self.cursor.PATH.get() == str():
+            for index in range(self.paths_menu.index("end") + 1):
+                self.paths_menu.entryconfig(index, state=DISABLED)
+        else:
+            for index in range(self.paths_menu.index("end") + 1):
+                self.paths_menu.entryconfig(index, state="normal")
+            self.init_graph()
+
+    def update_end_point(self, arg):
+        start = self.start_point.get()
+        tree = self.tree_cache.get(start)
+        if tree is not None:
+            self.tree_found(start, tree)
+            return
+        graph, version = self.graph, self.tree_cache.version
+
+        def callback(tree):
+            if version == self.tree_cache.version:
+                self.tree_cache.put(start, tree)
+                self.tree_found(start, tree)
+
+        self.worker.submit(
+            "tree", lambda cancel: nd.dijkstra(graph, start, cancel=cancel), callback
+        )
+
+    def tree_found(self, start: str, tree: list) -> None:
+        self.dist, self.precedent = tree
+        self.current_start = start
+        self.refresh_points()
+
+    def refresh_points(self) -> None:
+        self.start_point.set_index(self.nodes, self.graph.get)
+        # The end picker only searches the nodes reached from the start, none
+        # before a start is chosen, instead of filtering every node
+        self.end_point.set_index(
+            self.nodes,
+            lambda node: node != self.current_start
+            and self.dist.get(node, nd.MAX_VALUE) < nd.MAX_VALUE,
+            self.dist,
+        )
+
+    def file_version(self) -> int:
+        with nd.Database(self.cursor.PATH.get()) as db:
+            return nd.graph_version(db)
+
+    def editable_graph(self) -> list[str]:
+        # The tasks using the graph are cancelled and restarted once it is
+        # patched, those still running keep reading the graph they were given
+        # so the edits are made on a copy of it
+        cancelled = [
+            kind
+            for kind in ("tree", "path", "landmarks", "hierarchy")
+            if self.worker.cancel(kind)
+        ]
+        if isinstance(self.graph, nd.CSRGraph):
+            self.graph = self.graph.to_dict()
+            self.reverse = nd.build_reverse_graph(self.graph)
+        elif self.worker.pending:
+            self.graph = {node: dict(edges) for node, edges in self.graph.items()}
+            self.reverse = {node: dict(edges) for node, edges in self.reverse.items()}
+        return cancelled
+
+    def restart(self, kinds: list[str]) -> None:
+        if "tree" in kinds:
+            self.update_end_point(None)
+        if "path" in kinds:
+            self.find_path()
+        if "landmarks" in kinds:
+            self.compute_landmarks()
+        if "hierarchy" in kinds:
+            self.build_hierarchy()
+
+    def insert_path(self, start: str, end: str, length: int) -> None:
+        cancelled = self.editable_graph()
+        self.nodes.add(start)
+        self.nodes.add(end)
+        nd.insert_edge(
+            self.graph, self.dist, self.precedent, start, end, length, self.reverse
+        )
+        self.landmarks = None
+        self.hierarchy = None
+        self.tree_cache.bump()
+        if self.current_start:
+            self.tree_cache.put(self.current_start, [self.dist, self.precedent])
+        self.refresh_points()
+        self.restart(cancelled)
+
+    def remove_path(self, start: str, end: str) -> None:
+        cancelled = self.editable_graph()
+        nd.delete_edge(self.graph, self.dist, self.precedent, start, end, self.reverse)
+        self.landmarks = None
+        self.hierarchy = None
+        self.tree_cache.bump()
+        if self.current_start:
+            self.tree_cache.put(self.current_start, [self.dist, self.precedent])
+        self.refresh_points()
+        self.restart(cancelled)
+
+    def compute_landmarks(self) -> None:
+        graph, reverse, path = self.graph, self.reverse, self.cursor.PATH.get()
+        # Landmarks saved with an older edge version are never loaded
+        version, edge_version = self.tree_cache.version, self.file_version()
+
+        def task(cancel):
+            landmarks = nd.Landmarks.select(graph, reverse, k=8)
+            if not cancel.is_set():
+                with nd.Database(path) as db:
+                    landmarks.save(db, edge_version)
+            return landmarks
+
+        def callback(landmarks):
+            if version != self.tree_cache.version:
+                return
+            self.landmarks = landmarks
+            showinfo(
+                title="Landmarks computed!",
+                message=f"{len(self.landmarks.landmarks)} landmarks have been saved!",
+            )
+
+        self.worker.submit("landmarks", task, callback)
+
+    def build_hierarchy(self) -> None:
+        graph, path = self.graph, self.cursor.PATH.get()
+        # A hierarchy saved with an older edge version is never loaded either
+        version, edge_version = self.tree_cache.version, self.file_version()
+
+        def task(cancel):
+            hierarchy = nd.ContractionHierarchy.build(nd.iter_edges(graph))
+            if not cancel.is_set():
+                with nd.Database(path) as db:
+                    hierarchy.save(db, edge_version)
+            return hierarchy
+
+        def callback(hierarchy):
+            if version != self.tree_cache.version:
+                return
+            self.hierarchy = hierarchy
+            shortcuts = [edge for edge in self.hierarchy.edges.values() if edge[1]]
+            showinfo(
+                title="Contraction hierarchy built!",
+                message=f"{len(shortcuts)} shortcuts have been saved!",
+            )
+
+        self.worker.submit("hierarchy", task, callback)
+
+    def find_path(self) -> None:
+        start = self.start_point.get()
+        end = self.end_point.get()
+        if not self.start_point.valid(start):
+            showerror(
+                title="Error!",
+                message="The start point is not in the database!",
+            )
+        elif not self.end_point.valid(end):
+            showerror(
+                title="Error!",
+                message="The end point is not in the database!",
+            )
+        else:
+            graph, reverse = self.graph, self.reverse
+            hierarchy, landmarks = self.hierarchy, self.landmarks
+            route_cache = self.route_cache
+            version, edge_version = self.tree_cache.version, self.file_version()
+
+            def task(cancel):
+                # The routes found in previous sessions are read from the file
+                return route_cache.route(
+                    graph, reverse, start, end, hierarchy, landmarks, edge_version
+                )
+
+            def callback(result):
+                if version == self.tree_cache.version:
+                    self.path_found(start, end, *result)
+
+            self.worker.submit("path", task, callback)
+
+    def path_found(self, start: str, end: str, distance: int, shortest_path) -> None:
+        if shortest_path is None:
+            showerror(
+                title="Error!",
+                message="There is no path between the two points!",
+            )
+        else:
+            shortest_path.reverse()
+            showinfo(
+                title="Path found!",
+                message=f"The shortest path between {start} and {end} is:\n{shortest_path}\n and is {distance} long",
+            )
+
+    def create_file(self) -> None:
+        filetypes = (("PATH", f"*{self.cursor.TYPE}"),)
+        filename = sname(
+            title="Create a file",
+            initialdir=self.cursor.DIR,
+            filetypes=filetypes,
+        )
+        if filename != "":
+            filename = filename.strip(".db")
+            with nd.Database(filename + self.cursor.TYPE) as db:
+                nd.EdgeStore.create(db, compact=True)
+                showinfo(
+                    title="File successfully created!",
+                    message=f"{filename}{self.cursor.TYPE} has been created!",
+                )
+                self.cursor.PATH.set(filename + self.cursor.TYPE)
+
+    def open_file(self) -> None:
+        filetypes = (("PATH", self.cursor.TYPE),)
+        filename = fname(
+            title="Open a file",
+            initialdir=self.cursor.DIR,
+            filetypes=filetypes,
+        )
+        self.cursor.PATH.set(filename)
+        self.update_points()
+
+    def __init__(self, **kwargs):
+        Tk.__init__(self, **kwargs)
+        self.title("Odyssee pathfinder")
+        self.geometry("300x300")
+        self.resizable(0, 0)
+        self.frame = Frame(self, bg="#f25252")
+        self.frame.pack()
+        self.main_menu = Menu(self.frame)
+        self.config(menu=self.main_menu, bg="#f25252")
+        self.cursor = File(StringVar())
+        self.cursor.PATH.trace_add("write", self.update_points)
+        self.graph: dict[str, dict[str, int]] = dict()
+        self.reverse: dict[str, dict[str, int]] = dict()
+        self.nodes = nd.NameIndex()
+        self.landmarks: nd.Landmarks = None
+        self.hierarchy: nd.ContractionHierarchy = None
+        self.route_cache: nd.RouteCache = None
+        self.dist: dict[str, int] = dict()
+        self.precedent: dict[str, str] = dict()
+        self.tree_cache = nd.TreeCache(maxsize=16)
+        self.current_start: str = str()
+
+        self.file_menu = Menu(self.main_menu, tearoff=0)
+        self.file_menu.add_command(label="Create a file", command=self.create_file)
+        self.file_menu.add_command(label="Open a file", command=self.open_file)
+        self.file_menu.add_command(label="View...", command=lambda: StatsWindow(self))
+
+        self.paths_menu = Menu(self.main_menu, tearoff=0)
+        self.paths_menu.add_command(
+            label="Add a path...", command=lambda: AddPathWindow(self), state=DISABLED
+        )
+        self.paths_menu.add_command(
+            label="Remove a path...",
+            command=lambda: DeletePathWindow(self),
+            state=DISABLED,
+        )
+        self.paths_menu.add_command(
+            label="Compute landmarks",
+            command=self.compute_landmarks,
+            state=DISABLED,
+        )
+        self.paths_menu.add_command(
+            label="Build contraction hierarchy",
+            command=self.build_hierarchy,
+            state=DISABLED,
+        )
+
+        self.question_mark_menu = Menu(self.main_menu, tearoff=0)
+        self.question_mark_menu.add_command(label="Help!")
+        self.question_mark_menu.add_command(label="About us...")
+
+        self.main_menu.add_cascade(label="File", menu=self.file_menu)
+        self.main_menu.add_cascade(label="Paths", menu=self.paths_menu)
+        self.main_menu.add_cascade(label="?", menu=self.question_mark_menu)
+
+        self.start_label = Label(self.frame, text="Starting Node", width=44)
+        self.start_point = IndexedCombobox(self.frame, width=48)
+
+        self.end_label = Label(self.frame, text="Ending Node", width="44")
+        self.end_point = IndexedCombobox(self.frame, width=48)
+
+        self.button = Button(
+            self.frame, text="Find shortest path !", command=self.find_path
+        )
+        self.start_point.bind("<<ComboboxSelected>>", self.update_end_point)
+
+        self.start_label.pack()
+        self.start_point.pack()
+        self.end_label.pack()
+        self.end_point.pack()
+        self.button.pack()
+
+        self.progress = Progressbar(self.frame, mode="indeterminate", length=250)
+        self.progress.pack(pady=10)
+        self.worker = Worker(self, self.progress)
+
+    def destroy(self) -> None:
+        self.worker.shutdown(self.route_cache and self.route_cache.flush)
+        Tk.destroy(self)
+
+
+class Window(Toplevel):
+    def __init__(self, master: MainWindow = None, **kwargs) -> None:
+        Toplevel.__init__(self, master, **kwargs)
+        self.geometry("300x300")
+        self.resizable(0, 0)
+        self.config(bg="#f25252")
+        self.frame = Frame(self, bg="#f25252")
+        self.frame.pack(expand=True)
+        self.grab_set()
+
+        def handler():
+            self.master.refresh_points()
+            self.destroy()
+
+        self.protocol("WM_DELETE_WINDOW", handler)
+
+
+class AddPathWindow(Window):
+    def __init__(self, master: MainWindow = None, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self.title("Add a path...")
+        self.construct_body()
+        self.master = master
+
+    def update_combo(
+        self,
+    ) -> None:
+        self.start_combo.set_index(self.master.nodes)
+
+    def update_end_combo(self, event) -> None:
+        start = self.start_combo.get()
+        self.end_combo.set_index(self.master.nodes, lambda node: node != start)
+
+    def add_path(self) -> None:
+        starting_node = self.start_combo.get().strip()
+        ending_node = self.end_combo.get().strip()
+        length = self.length_entry.get().strip()
+        if starting_node and ending_node and length:
+            if starting_node == ending_node:
+                showinfo(
+                    title="Error",
+                    message="Starting and ending node cannot be the same!",
+                )
+            else:
+                with nd.Database(self.master.cursor.PATH.get()) as db:
+                    store = nd.EdgeStore(db)
+                    try:
+                        if self.check_var.get() == 1:
+                            sep = "<-"
+                            store.insert(ending_node, starting_node, length)
+                            db.remove_table(nd.Landmarks.TABLE_NAME)
+                            self.master.insert_path(ending_node, starting_node, length)
+                        else:
+                            sep = "-"
+                        store.insert(starting_node, ending_node, length)
+                        db.remove_table(nd.Landmarks.TABLE_NAME)
+                        self.master.insert_path(starting_node, ending_node, length)
+
+                        showinfo(
+                            title="Path successfully added!",
+                            message=f"{starting_node}{sep}{length}->{ending_node} has been added!",
+                        )
+                    except IE:
+                        showinfo(
+                            title="Path already exists!",
+                            message=f"{starting_node}{sep}{length}->{ending_node} already exists!",
+                        )
+                self.update_combo()
+        else:
+            showerror(
+                title="Incomplete entry!",
+                message="Make sure to submit every argument...",
+            )
+
+    def construct_body(self) -> None:
+
+        self.check_var = IntVar()
+        self.check_button = Checkbutton(
+            self.frame,
+            text="Two-way",
+            variable=self.check_var,
+            onvalue=1,
+            offvalue=0,
+        )
+        self.check_button.pack()
+        self.start_label = Label(self.frame, text="Starting node", width=44)
+        self.start_combo = IndexedCombobox(self.frame, width=48)
+        self.start_label.pack()
+        self.start_combo.pack()
+
+        self.end_label = Label(self.frame, text="Ending node", width=44)
+        self.end_combo = IndexedCombobox(self.frame, width=48)
+        self.end_label.pack()
+        self.end_combo.pack()
+        self.update_combo()
+        self.start_combo.bind("<<ComboboxSelected>>", self.update_end_combo)
+
+        self.length_label = Label(self.frame, text="Length", width=44)
+        self.length_entry = OnlyIntEntry(self.frame, width=50)
+        self.length_label.pack()
+        self.length_entry.pack()
+
+        self.submit = Button(self.frame, text="Submit!", command=self.add_path)
+        self.submit.pack()
+
+
+class DeletePathWindow(Window):
+    """Browses the paths of the file a page at a time, read from the database
+    on demand, so that opening it never lists every path of a large map"""
+
+    PAGE_SIZE = 8
+
+    def __init__(self, master: MainWindow = None, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self.geometry("300x300")
+        self.title("Remove a path...")
+        self.rows: list[tuple[str, str, int]] = []
+        # The last path before each page, None before the first one
+        self.anchors: list[tuple[str, str]] = [None]
+        self.construct_body()
+        self.master = master
+
+    def load_page(self) -> None:
+        with nd.Database(self.master.cursor.PATH.get()) as db:
+            self.rows = nd.EdgeStore(db).page(
+                self.anchors[-1], self.PAGE_SIZE, self.filter_var.get().strip()
+            )
+        self.listbox.delete(0, "end")
+        for start, end, length in self.rows:
+            self.listbox.insert("end", f"{start}-{length}->{end}")
+        self.previous_button["state"] = "normal" if len(self.anchors) > 1 else DISABLED
+        self.next_button["state"] = (
+            "normal" if len(self.rows) == self.PAGE_SIZE else DISABLED
+        )
+
+    def filter_changed(self, *args) -> None:
+        self.anchors = [None]
+        self.load_page()
+
+    def next_page(self) -> None:
+        if self.rows:
+            self.anchors.append(self.rows[-1][:2])
+            self.load_page()
+
+    def previous_page(self) -> None:
+        if len(self.anchors) > 1:
+            self.anchors.pop()
+            self.load_page()
+
+    def delete_path(self) -> None:
+        selection = self.listbox.curselection()
+        if not selection:
+            showerror(title="No path selected!", message="Select a path to delete...")
+            return
+        start, end, length = self.rows[selection[0]]
+
+        with nd.Database(self.master.cursor.PATH.get()) as db:
+            if nd.EdgeStore(db).delete(start, end):
+                db.remove_table(nd.Landmarks.TABLE_NAME)
+                showinfo(
+                    title="Path successfully deleted!",
+                    message=f"{start}-{length}->{end} has been deleted!",
+                )
+            else:
+                showinfo(
+                    title="Path already deleted!",
+                    message=f"{start}-{length}->{end} does not exist anymore!",
+                )
+        self.master.remove_path(start, end)
+        self.load_page()
+        if not self.rows and len(self.anchors) > 1:
+            self.previous_page()
+
+    def construct_body(self) -> None:
+        self.filter_label = Label(
+            self.frame, text="Starting node begins with", width=44
+        )
+        self.filter_var = StringVar()
+        self.filter_entry = Entry(self.frame, textvariable=self.filter_var, width=50)
+        self.filter_var.trace_add("write", self.filter_changed)
+        self.filter_label.pack()
+        self.filter_entry.pack()
+
+        self.label = Label(self.frame, text="Paths", width=44)
+        self.listbox = Listbox(self.frame, width=48, height=self.PAGE_SIZE)
+        self.label.pack()
+        self.listbox.pack()
+
+        self.buttons = Frame(self.frame, bg="#f25252")
+        self.previous_button = Button(
+            self.buttons, text="<", command=self.previous_page
+        )
+        self.button = Button(self.buttons, text="Delete", command=self.delete_path)
+        self.next_button = Button(self.buttons, text=">", command=self.next_page)
+        self.previous_button.pack(side="left")
+        self.button.pack(side="left")
+        self.next_button.pack(side="left")
+        self.buttons.pack()
+
+        self.load_page()
+
+
+class StatsWindow(Window):
+    def __init__(self, master: MainWindow = None, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        # The statistics are watched while the main window is used
+        self.grab_release()
+        self.geometry("520x420")
+        self.title("Statistics")
+        self.master = master
+        self.construct_body()
+        self.refresh()
+
+    def toggle(self) -> None:
+        if self.enabled.get() == 1:
+            nd.stats.enable()
+        else:
+            nd.stats.disable()
+
+    def refresh(self) -> None:
+        cache = self.master.tree_cache.stats()
+        lines = [
+            f"Tree cache: {cache['hits']} hits, {cache['misses']} misses, "
+            f"{cache['size']}/{cache['maxsize']} trees",
+            "",
+            nd.stats.report() or "Nothing collected yet",
+        ]
+        self.text.config(text="\n".join(lines))
+        self.job = self.after(500, self.refresh)
+
+    def destroy(self) -> None:
+        self.after_cancel(self.job)
+        Window.destroy(self)
+
+    def construct_body(self) -> None:
+        self.enabled = IntVar(value=int(nd.stats.enabled))
+        self.check_button = Checkbutton(
+            self.frame,
+            text="Collect statistics",
+            variable=self.enabled,
+            onvalue=1,
+            offvalue=0,
+            command=self.toggle,
+        )
+        self.reset_button = Button(self.frame, text="Reset", command=nd.stats.reset)
+        self.text = Label(self.frame, font=("Courier", 9), justify="left", anchor="nw")
+        self.check_button.pack()
+        self.reset_button.pack()
+        self.text.pack(fill="both", expand=True)
@@ -1,2 +1,39 @@
-from .dijkstra_ import find_shortest_path, build_graph, dijkstra
-from .sqlite3_wrapper import Database
+from .dijkstra_ import (
+    find_shortest_path,
+    find_bidirectional_path,
+    build_graph,
+    build_reverse_graph,
+    iter_edges,
+    dijkstra,
+    dijkstra_ids,
+    bounded_dijkstra,
+    MAX_VALUE,
+    bidirectional_dijkstra,
+)
+from .csr_graph import CSRGraph
+from .lazy_graph import LazyGraph
+from .sqlite3_wrapper import Database, ConnectionManager, connections
+from .tree_cache import TreeCache
+from .dynamic_sssp import insert_edge, delete_edge
+from .landmarks import Landmarks, astar
+from .contraction import ContractionHierarchy
+from .matrix import distance_matrix, write_matrix
+from .schema import (
+    DatabaseStructure,
+    CompactStructure,
+    schema_version,
+    structure_of,
+    id_generator,
+    create_indexes,
+    install_version_triggers,
+    graph_version,
+)
+from .snapshot import load_snapshot, read_snapshot, write_snapshot
+from .importer import read_edges, import_edges
+from .routing import shortest_path
+from .stats import Stats, stats
+from .aggregate import summarize_rows, summarize_array
+from .export import write_csv, export_table, export_matrix, export_paths, tree_paths
+from .edge_store import EdgeStore, migrate_to_compact
+from .name_index import NameIndex
+from .route_cache import RouteCache
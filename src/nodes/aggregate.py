@@ -0,0 +1,88 @@
+""" Single pass summaries of rows: maximum, minimum and average of every column"""
+from itertools import chain
+
+
+def summarize_rows(rows) -> list[tuple]:
+    """Function to summarize rows in a single pass, without holding them.
+
+    Like SQL aggregates the None values are ignored, and a column which is
+    not numeric gets no average.
+
+    @param rows Any iterable of rows of the same length, like Database.stream().
+
+    @returns For every column ((maximum, position), (minimum, position), average),
+    the positions being the indexes of the first rows holding the maximum and
+    the minimum. An empty list if there are no rows."""
+    columns = None
+    for position, row in enumerate(rows):
+        if columns is None:
+            # [maximum, its position, minimum, its position, total, count]
+            columns = [[None, None, None, None, 0, 0] for _ in row]
+        for column, value in zip(columns, row):
+            if value is None:
+                continue
+            if column[5] == 0:
+                column[0:4] = value, position, value, position
+            elif value > column[0]:
+                column[0], column[1] = value, position
+            elif value < column[2]:
+                column[2], column[3] = value, position
+            if column[4] is not None:
+                if isinstance(value, (int, float)):
+                    column[4] += value
+                else:
+                    column[4] = None
+            column[5] += 1
+    return [
+        (
+            (hi_, hi_position),
+            (lo_, lo_position),
+            total / count if total is not None and count else None,
+        )
+        for hi_, hi_position, lo_, lo_position, total, count in columns or ()
+    ]
+
+
+def summarize_array(rows) -> list[tuple]:
+    """Function to summarize numeric rows with NumPy, imported only when needed.
+
+    The rows are packed into a float array as they are read, never as Python
+    objects, and summarized with vectorized reductions. None values become
+    NaN and are ignored, a column holding only None being summarized as by
+    summarize_rows().
+
+    @param rows A 2D numpy array, or any iterable of rows of the same length.
+
+    @returns The same summary as summarize_rows()."""
+    import numpy as np
+
+    if not isinstance(rows, np.ndarray):
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return []
+        values = chain(first, chain.from_iterable(rows))
+        values = (np.nan if value is None else value for value in values)
+        rows = np.fromiter(values, dtype=float).reshape(-1, len(first))
+    array = np.asarray(rows, dtype=float)
+    if array.size == 0:
+        return []
+    # The reductions raise or warn on a column of NaN only, it is zeroed first
+    empty = np.isnan(array).all(axis=0)
+    filled = np.where(empty, 0.0, array)
+    hi_positions = np.nanargmax(filled, axis=0)
+    lo_positions = np.nanargmin(filled, axis=0)
+    averages = np.nanmean(filled, axis=0)
+    columns = range(array.shape[1])
+    return [
+        (
+            ((None, None), (None, None), None)
+            if empty[c]
+            else (
+                (array[hi_positions[c], c].item(), int(hi_positions[c])),
+                (array[lo_positions[c], c].item(), int(lo_positions[c])),
+                averages[c].item(),
+            )
+        )
+        for c in columns
+    ]
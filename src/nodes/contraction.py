@@ -0,0 +1,268 @@
+""" Contraction Hierarchies preprocessing and query engine"""
+from heapq import heapify, heappop, heappush
+from .schema import graph_version, install_version_triggers, structure_of
+from .sqlite3_wrapper import Database
+
+
+class ContractionHierarchy:
+    """A contraction hierarchy of a graph.
+
+    Every node gets a rank, the order in which it was contracted. Contracting
+    a node removes it from the graph and adds a shortcut u->w for every path
+    u->v->w which is the only shortest path between u and w. A shortcut
+    remembers the node it skips (its middle) so it can be unpacked back into
+    the original edges.
+
+    A query is then a bidirectional dijkstra which only goes up the ranks,
+    forward on upward and backward on downward."""
+
+    NODES_TABLE = "CHNodes"
+    EDGES_TABLE = "CHEdges"
+    META_TABLE = "CHMeta"
+    NODES_COLUMNS = (("Node", "text", "PRIMARY KEY"), ("Rank", "integer", "NOT NULL"))
+    EDGES_COLUMNS = (
+        ("Start", "text", "NOT NULL"),
+        ("End", "text", "NOT NULL"),
+        ("Length", "integer", "NOT NULL"),
+        ("Middle", "text"),
+    )
+    META_COLUMNS = (("Key", "text", "PRIMARY KEY"), ("Value", "integer"))
+
+    def __init__(
+        self,
+        rank: dict[str, int],
+        edges: dict[tuple[str, str], tuple[int, str]],
+    ) -> None:
+        """The constructor of the ContractionHierarchy class
+
+        @param rank The rank of every node.
+
+        @param edges The original edges and the shortcuts, {(start, end): (length, middle)},
+        middle being None for an original edge."""
+        self.rank = rank
+        self.edges = edges
+        self.upward = {}
+        self.downward = {}
+        for (start, end), (lenght, _) in edges.items():
+            if rank[end] > rank[start]:
+                self.upward.setdefault(start, {})[end] = lenght
+            else:
+                self.downward.setdefault(end, {})[start] = lenght
+
+    @classmethod
+    def build(
+        cls, edges: list[list], witness_limit: int = 64
+    ) -> "ContractionHierarchy":
+        """Function to build the hierarchy of a list of edges [start, end, length].
+
+        Nodes are contracted by increasing edge difference (shortcuts added minus
+        edges removed, plus the number of already contracted neighbours), the
+        priorities being updated lazily. The witness searches settle at most
+        witness_limit nodes, which may add a few useless shortcuts but never
+        misses a needed one.
+
+        @param edges The edges of the graph, as given to build_graph().
+
+        @param witness_limit The maximum number of nodes settled by a witness search."""
+        out, inn = {}, {}
+        all_edges = {}
+        for start, end, lenght in edges:
+            lenght = int(lenght)
+            out.setdefault(end, {})
+            inn.setdefault(start, {})
+            if start == end or lenght >= out.setdefault(start, {}).get(end, lenght + 1):
+                continue
+            out[start][end] = lenght
+            inn.setdefault(end, {})[start] = lenght
+            all_edges[(start, end)] = (lenght, None)
+
+        contracted_neighbours = dict.fromkeys(out, 0)
+
+        def shortcuts(node: str) -> list[tuple[str, str, int]]:
+            needed = []
+            for source, lenght_in in inn[node].items():
+                if not out[node]:
+                    break
+                limit = lenght_in + max(out[node].values())
+                dist = cls.witness_(out, source, node, limit, witness_limit)
+                for target, lenght_out in out[node].items():
+                    if target == source:
+                        continue
+                    lenght = lenght_in + lenght_out
+                    if dist.get(target, lenght + 1) > lenght:
+                        needed.append((source, target, lenght))
+            return needed
+
+        def priority(node: str) -> int:
+            return (
+                len(shortcuts(node))
+                - len(inn[node])
+                - len(out[node])
+                + contracted_neighbours[node]
+            )
+
+        heap = [(priority(node), node) for node in out]
+        heapify(heap)
+        rank = {}
+        while heap:
+            _, node = heappop(heap)
+            current = priority(node)
+            if heap and current > heap[0][0]:
+                heappush(heap, (current, node))
+                continue
+            rank[node] = len(rank)
+            for source, target, lenght in shortcuts(node):
+                if lenght < out[source].get(target, lenght + 1):
+                    out[source][target] = lenght
+                    inn[target][source] = lenght
+                    all_edges[(source, target)] = (lenght, node)
+            for neighbour in inn[node]:
+                del out[neighbour][node]
+                contracted_neighbours[neighbour] += 1
+            for neighbour in out[node]:
+                del inn[neighbour][node]
+                contracted_neighbours[neighbour] += 1
+            del out[node], inn[node]
+        return cls(rank, all_edges)
+
+    @staticmethod
+    def witness_(
+        out: dict[str, dict[str, int]],
+        source: str,
+        ignored: str,
+        limit: int,
+        settle_limit: int,
+    ) -> dict[str, int]:
+        """Function to run a dijkstra from source which avoids the ignored node,
+        stopping beyond the limit distance or after settle_limit nodes"""
+        dist = {source: 0}
+        heap = [(0, source)]
+        settled = 0
+        while heap and settled < settle_limit:
+            dist_1, node_1 = heappop(heap)
+            if dist_1 > dist[node_1]:
+                continue
+            if dist_1 > limit:
+                break
+            settled += 1
+            for node_2, lenght in out[node_1].items():
+                if node_2 == ignored:
+                    continue
+                dist_2 = dist_1 + lenght
+                if dist_2 < dist.get(node_2, dist_2 + 1):
+                    dist[node_2] = dist_2
+                    heappush(heap, (dist_2, node_2))
+        return dist
+
+    def query(self, start: str, end: str) -> list[int, list[str]]:
+        """Function to find the shortest path between two nodes.
+
+        It returns [distance, path] with the path from the end to the start,
+        like find_shortest_path(), or [None, None] if there is no path. A node
+        is its own path, even if it is not in the hierarchy, like with
+        bidirectional_dijkstra()."""
+        if start == end:
+            return [0, [start]]
+        if start not in self.rank or end not in self.rank:
+            return [None, None]
+        searches = []
+        for source, adjacency in (start, self.upward), (end, self.downward):
+            dist = {source: 0}
+            links = {}
+            heap = [(0, source)]
+            while heap:
+                dist_1, node_1 = heappop(heap)
+                if dist_1 > dist[node_1]:
+                    continue
+                for node_2, lenght in adjacency.get(node_1, {}).items():
+                    dist_2 = dist_1 + lenght
+                    if dist_2 < dist.get(node_2, dist_2 + 1):
+                        dist[node_2] = dist_2
+                        links[node_2] = node_1
+                        heappush(heap, (dist_2, node_2))
+            searches.append((dist, links))
+        (forward, precedent), (backward, successor) = searches
+        meeting = min(
+            (node for node in forward if node in backward),
+            key=lambda node: forward[node] + backward[node],
+            default=None,
+        )
+        if meeting is None:
+            return [None, None]
+
+        hops = [meeting]
+        while hops[-1] != start:
+            hops.append(precedent[hops[-1]])
+        hops.reverse()
+        while hops[-1] != end:
+            hops.append(successor[hops[-1]])
+        path = [start]
+        for first, second in zip(hops, hops[1:]):
+            path.extend(self.unpack_(first, second))
+        path.reverse()
+        return [forward[meeting] + backward[meeting], path]
+
+    def unpack_(self, start: str, end: str) -> list[str]:
+        """Function to replace an edge by the original nodes it goes through,
+        start excluded"""
+        path = []
+        stack = [(start, end)]
+        while stack:
+            first, second = stack.pop()
+            middle = self.edges[(first, second)][1]
+            if middle is None:
+                path.append(second)
+            else:
+                stack.append((middle, second))
+                stack.append((first, middle))
+        return path
+
+    def save(self, db: Database, version: int = None) -> None:
+        """Function to store the hierarchy in the database, replacing the previous one
+
+        @param db An opened Database.
+
+        @param version Optionally, the edge version of the graph the hierarchy
+        was built from, the current one of the database by default."""
+        struct = structure_of(db)
+        if db.select("sqlite_master", "name", "name = ?", (struct.EDGES_TABLE,)):
+            install_version_triggers(db, struct)
+        if version is None:
+            version = graph_version(db)
+        for table, columns in (
+            (self.NODES_TABLE, self.NODES_COLUMNS),
+            (self.EDGES_TABLE, self.EDGES_COLUMNS),
+            (self.META_TABLE, self.META_COLUMNS),
+        ):
+            db.remove_table(table)
+            db.create_table(table, columns)
+        db.write_many(self.NODES_TABLE, ("Node", "Rank"), self.rank.items())
+        db.write_many(
+            self.EDGES_TABLE,
+            ("Start", "End", "Length", "Middle"),
+            (
+                (start, end, lenght, middle)
+                for (start, end), (lenght, middle) in self.edges.items()
+            ),
+        )
+        db.write(self.META_TABLE, ("Key", "Value"), ("edge_version", version))
+
+    @classmethod
+    def load(cls, db: Database) -> "ContractionHierarchy":
+        """Function to load the hierarchy stored by save(), or None if there is
+        none or if the edges changed since it was built
+
+        @param db An opened Database."""
+        if not db.select("sqlite_master", "name", "name = ?", (cls.META_TABLE,)):
+            return None
+        version = db.select(cls.META_TABLE, "Value", "Key = 'edge_version'")
+        if not version or version[0][0] != graph_version(db):
+            return None
+        rank = dict(db.get(cls.NODES_TABLE, "Node, Rank"))
+        hierarchy_edges = {
+            (start, end): (lenght, middle)
+            for start, end, lenght, middle in db.get(
+                cls.EDGES_TABLE, "Start, End, Length, Middle"
+            )
+        }
+        return cls(rank, hierarchy_edges)
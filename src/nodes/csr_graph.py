@@ -0,0 +1,167 @@
+""" Compact graph stored in compressed sparse row (CSR) form"""
+from array import array
+from collections import defaultdict
+
+
+class CSRGraph:
+    """A graph whose node names are interned to dense integer ids.
+
+    The adjacency of node i is stored in targets[offsets[i]:offsets[i + 1]]
+    with the matching lengths in weights, all three being flat arrays of
+    64 bits integers. The names list maps an id to its name and the ids
+    dictionary maps a name back to its id.
+
+    The class also behaves like the read-only dictionary returned by
+    build_graph(), {'A':{'B', lenght},...}, so it can be given to any
+    function expecting such a graph."""
+
+    def __init__(
+        self, names: list[str], offsets, targets, weights, buffer=None
+    ) -> None:
+        """The constructor of the CSRGraph class
+
+        @param names The name of every node, indexed by id.
+
+        @param offsets The start of each node's adjacency, len(names) + 1 items.
+
+        @param targets The id of the ending node of every edge.
+
+        @param weights The length of every edge.
+
+        @param buffer Optionally, the memory-mapped file the arrays are views of,
+        unmapped by close()."""
+        self.names = names
+        self.ids = {name: node_id for node_id, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.buffer = buffer
+
+    def __reduce__(self):
+        # The arrays of a snapshot are views of a memory-mapped file, which
+        # can't be pickled, they are copied to arrays for the spawned processes
+        arrays = (
+            values if isinstance(values, array) else array("q", values.tobytes())
+            for values in (self.offsets, self.targets, self.weights)
+        )
+        return type(self), (self.names, *arrays)
+
+    def close(self) -> None:
+        """Function to unmap the file the arrays of a snapshot are views of, so
+        it can be rewritten, the graph can't be searched anymore afterwards"""
+        if self.buffer is None:
+            return
+        for values in self.offsets, self.targets, self.weights:
+            values.release()
+        self.buffer.close()
+        self.buffer = None
+
+    @classmethod
+    def from_edges(cls, edges: list[list]) -> "CSRGraph":
+        """Function to build a CSR graph from a list of edges [start, end, length]
+
+        @param edges Any iterable of edges, it is only read once."""
+        ids = {}
+        names = []
+        sources = array("q")
+        ends = array("q")
+        lenghts = array("q")
+        for edge in edges:
+            for name in edge[0], edge[1]:
+                if name not in ids:
+                    ids[name] = len(names)
+                    names.append(name)
+            sources.append(ids[edge[0]])
+            ends.append(ids[edge[1]])
+            lenghts.append(int(edge[2]))
+        return cls.from_ids_(names, sources, ends, lenghts)
+
+    @classmethod
+    def from_ids_(cls, names: list[str], sources, ends, lenghts) -> "CSRGraph":
+        """Function to build a CSR graph from parallel arrays of node ids and lengths"""
+        # Counting sort of the edges by their starting node
+        offsets = array("q", bytes(8 * (len(names) + 1)))
+        for source in sources:
+            offsets[source + 1] += 1
+        for node_id in range(len(names)):
+            offsets[node_id + 1] += offsets[node_id]
+        position = offsets[:-1]
+        targets = array("q", bytes(8 * len(sources)))
+        weights = array("q", bytes(8 * len(sources)))
+        for source, end, lenght in zip(sources, ends, lenghts):
+            targets[position[source]] = end
+            weights[position[source]] = lenght
+            position[source] += 1
+        return cls(names, offsets, targets, weights)
+
+    def reverse(self) -> "CSRGraph":
+        """Function to build the reverse graph, every edge A->B becoming B->A.
+        Both graphs share the same names and ids."""
+        sources = array("q")
+        for node_id in range(self.node_count):
+            sources.extend(
+                [node_id] * (self.offsets[node_id + 1] - self.offsets[node_id])
+            )
+        return self.from_ids_(self.names, self.targets, sources, self.weights)
+
+    def to_dict(self) -> dict[str, dict[str, int]]:
+        """Function to convert the graph to the dictionary returned by build_graph()"""
+        return defaultdict(dict, self.items())
+
+    @property
+    def node_count(self) -> int:
+        """The number of nodes of the graph, with or without outgoing edges"""
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        """The number of edges of the graph"""
+        return len(self.targets)
+
+    def id_of(self, name: str) -> int:
+        """Function to get the id of a node from its name"""
+        return self.ids[name]
+
+    def name_of(self, node_id: int) -> str:
+        """Function to get the name of a node from its id"""
+        return self.names[node_id]
+
+    def neighbours(self, node_id: int) -> zip:
+        """Function to iterate over the (id, length) pairs of the neighbours of a node"""
+        first, last = self.offsets[node_id], self.offsets[node_id + 1]
+        return zip(self.targets[first:last], self.weights[first:last])
+
+    def get(self, name: str, default=None) -> dict[str, int]:
+        """Function to get the neighbours of a node by name, as build_graph() would"""
+        node_id = self.ids.get(name)
+        if node_id is None or self.offsets[node_id] == self.offsets[node_id + 1]:
+            return default
+        return {self.names[end]: lenght for end, lenght in self.neighbours(node_id)}
+
+    def __getitem__(self, name: str) -> dict[str, int]:
+        neighbours = self.get(name)
+        if neighbours is None:
+            raise KeyError(name)
+        return neighbours
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def keys(self) -> list[str]:
+        """Function to list the nodes with at least one outgoing edge"""
+        offsets = self.offsets
+        return [
+            name
+            for node_id, name in enumerate(self.names)
+            if offsets[node_id] != offsets[node_id + 1]
+        ]
+
+    def items(self) -> list[tuple[str, dict[str, int]]]:
+        """Function to list the nodes with at least one outgoing edge and their neighbours"""
+        return [(name, self[name]) for name in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
@@ -1,7 +1,14 @@
 """ Implementation of dijkstra algorithm in python"""
 from collections import defaultdict
+from heapq import heappop, heappush
+from math import inf
+from threading import Event
+from .csr_graph import CSRGraph
+from .lazy_graph import LazyGraph
+from .stats import stats
 
-MAX_VALUE = 999
+# The distance of a node which is not reached, greater than any path
+MAX_VALUE = inf
 
 
 def build_graph(edges: list[list]) -> dict[str, dict[str, int]]:
@@ -18,6 +25,25 @@ def build_graph(edges: list[list]) -> dict[str, dict[str, int]]:
     return graph
 
 
+def iter_edges(graph: dict[str, dict[str, int]]):
+    """Generator of the edges [start, end, length] of a graph built with build_graph()"""
+    for first_edge, neighbours in graph.items():
+        for second_edge, lenght in neighbours.items():
+            yield [first_edge, second_edge, lenght]
+
+
+def build_reverse_graph(graph: dict[str, dict[str, int]]) -> dict[str, dict[str, int]]:
+    """Function to build the reverse graph of adjency of a graph built with build_graph(),
+    every edge A->B of the graph becoming B->A : {'B':{'A', lenght},..."""
+    if isinstance(graph, (CSRGraph, LazyGraph)):
+        return graph.reverse()
+    reverse = defaultdict(dict)
+    for first_edge, neighbours in graph.items():
+        for second_edge, lenght in neighbours.items():
+            reverse[second_edge][first_edge] = lenght
+    return reverse
+
+
 def init_(edges: list[list], starting_node: str) -> dict[str, int]:
     """Function to initialise a dictionary of distance
     between the starting node and every other node from the graph"""
@@ -29,48 +55,182 @@ def init_(edges: list[list], starting_node: str) -> dict[str, int]:
     return dist
 
 
-def find_min_(nodes: list[str], dist: dict[str, int]) -> str:
-    """Function to find the nearest node from the starting node in a list of remaining nodes"""
-    minimum = MAX_VALUE
-    sommet = None
-    for node in nodes:
-        if dist[node] < minimum:
-            minimum = dist[node]
-            sommet = node
-    return sommet
+def dijkstra(
+    graph: dict[str, dict[str, int]],
+    start: str,
+    edges: list[list] = None,
+    target: str = None,
+    cancel: Event = None,
+) -> list[dict[str, int], dict[str, str]]:
+    """Function wich implement the algorithm of dijkstra with a binary heap.
+    Stale heap entries are skipped when popped instead of being removed (lazy deletion).
+    If edges is given every node of the graph gets a distance, otherwise only the reached ones.
+    If target is given the search stops as soon as the target node is settled.
+    If cancel is given the search stops as soon as it is set, from another
+    thread, leaving an incomplete result."""
+    if isinstance(graph, CSRGraph):
+        return dijkstra_csr_(graph, start, edges, target, cancel)
+    precedent = {}
+    dist = init_(edges, start) if edges is not None else {start: 0}
+    search_(graph, dist, precedent, [(0, start)], target, cancel)
+    return [dist, precedent]
 
 
-def maj_dist_(
-    node_1: str,
-    node_2: str,
-    graph: list[str],
+def search_(
+    graph: dict[str, dict[str, int]],
     dist: dict[str, int],
     precedent: dict[str, str],
-) -> dict[str, str]:
-    """Function wich update the distance of a node to the starting node
-    and return a dictionary of nodes and their precedent node."""
+    heap: list[tuple[int, str]],
+    target: str = None,
+    cancel: Event = None,
+) -> None:
+    """Function wich settle the nodes of a heap of (distance, node) in order,
+    updating dist and precedent in place until the heap is empty, the target is settled
+    or cancel is set"""
+    pushes, pops, settled, relaxations = len(heap), 0, 0, 0
+    while heap:
+        dist_1, node_1 = heappop(heap)
+        pops += 1
+        if dist_1 > dist[node_1]:
+            continue
+        if node_1 == target or (cancel is not None and cancel.is_set()):
+            break
+        settled += 1
+        for node_2, lenght in (graph.get(node_1) or {}).items():
+            dist_2 = dist_1 + lenght
+            if dist_2 < dist.get(node_2, MAX_VALUE):
+                relaxations += 1
+                dist[node_2] = dist_2
+                precedent[node_2] = node_1
+                heappush(heap, (dist_2, node_2))
+    if stats.enabled:
+        stats.count(
+            "dijkstra",
+            searches=1,
+            pushes=pushes + relaxations,
+            pops=pops,
+            settled=settled,
+            relaxations=relaxations,
+        )
 
-    if dist[node_2] > dist[node_1] + graph[node_1][node_2]:
-        dist[node_2] = dist[node_1] + graph[node_1][node_2]
-        precedent[node_2] = node_1
-    return precedent
 
+def bounded_dijkstra(
+    graph: dict[str, dict[str, int]],
+    start: str,
+    radius: int = None,
+    count: int = None,
+    cancel: Event = None,
+):
+    """Generator of the nodes reachable from start, as (node, distance, precedent)
+    in increasing distance, start coming first with no precedent.
 
-def dijkstra(
-    graph: dict[str, dict[str, int]], start: str, edges: list[list]
+    Unlike dijkstra() nothing is expanded beyond what is asked: the search stops
+    before the first node farther than radius, after count nodes, once cancel
+    is set or as soon as the generator is closed.
+
+    @param graph The graph, as built by build_graph(), a CSRGraph or a LazyGraph.
+
+    @param radius Optionally, the maximum distance of the nodes.
+
+    @param count Optionally, the maximum number of nodes, the K nearest ones."""
+    dist, precedent = {start: 0}, {}
+    heap = [(0, start)]
+    pops, settled, relaxations = 0, 0, 0
+    try:
+        while heap and (count is None or settled < count):
+            dist_1, node_1 = heappop(heap)
+            pops += 1
+            if dist_1 > dist[node_1]:
+                continue
+            if (radius is not None and dist_1 > radius) or (
+                cancel is not None and cancel.is_set()
+            ):
+                break
+            settled += 1
+            yield node_1, dist_1, precedent.get(node_1)
+            for node_2, lenght in (graph.get(node_1) or {}).items():
+                dist_2 = dist_1 + lenght
+                if dist_2 < dist.get(node_2, MAX_VALUE):
+                    relaxations += 1
+                    dist[node_2] = dist_2
+                    precedent[node_2] = node_1
+                    heappush(heap, (dist_2, node_2))
+    finally:
+        if stats.enabled:
+            stats.count(
+                "bounded",
+                searches=1,
+                pushes=1 + relaxations,
+                pops=pops,
+                settled=settled,
+                relaxations=relaxations,
+            )
+
+
+def dijkstra_ids(
+    graph: CSRGraph, start: int, target: int = None, cancel: Event = None
+) -> tuple[list[int], list[int]]:
+    """Function wich implement the algorithm of dijkstra on the ids of a CSR graph.
+    It returns a list of distances and a list of precedent ids, -1 meaning no precedent.
+    Like dijkstra() it stops early once target is settled or cancel is set.
+    """
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = [MAX_VALUE] * graph.node_count
+    precedent = [-1] * graph.node_count
+    dist[start] = 0
+    heap = [(0, start)]
+    pops, settled, relaxations = 0, 0, 0
+    while heap:
+        dist_1, node_1 = heappop(heap)
+        pops += 1
+        if dist_1 > dist[node_1]:
+            continue
+        if node_1 == target or (cancel is not None and cancel.is_set()):
+            break
+        settled += 1
+        for index in range(offsets[node_1], offsets[node_1 + 1]):
+            node_2 = targets[index]
+            dist_2 = dist_1 + weights[index]
+            if dist_2 < dist[node_2]:
+                relaxations += 1
+                dist[node_2] = dist_2
+                precedent[node_2] = node_1
+                heappush(heap, (dist_2, node_2))
+    if stats.enabled:
+        stats.count(
+            "dijkstra",
+            searches=1,
+            pushes=1 + relaxations,
+            pops=pops,
+            settled=settled,
+            relaxations=relaxations,
+        )
+    return dist, precedent
+
+
+def dijkstra_csr_(
+    graph: CSRGraph,
+    start: str,
+    edges: list[list] = None,
+    target: str = None,
+    cancel: Event = None,
 ) -> list[dict[str, int], dict[str, str]]:
-    """Function wich implement the algorithm of dijkstra"""
+    """Function to run dijkstra_ids() by name and translate its result
+    in the [dist, precedent] form returned by dijkstra()"""
+    names = graph.names
+    if start not in graph.ids:
+        dist = init_(edges, start) if edges is not None else {start: 0}
+        return [dist, {}]
+    dist_ids, precedent_ids = dijkstra_ids(
+        graph, graph.ids[start], graph.ids.get(target), cancel
+    )
+    dist = {}
     precedent = {}
-    nodes = list(graph.keys())
-    dist = init_(edges, start)
-    while nodes:
-        node_1 = find_min_(nodes, dist)
-        if node_1 is not None:
-            nodes.remove(node_1)
-            for node_2 in graph[node_1]:
-                precedent = maj_dist_(node_1, node_2, graph, dist, precedent)
-        else:
-            break
+    for node_id, name in enumerate(names):
+        if dist_ids[node_id] < MAX_VALUE or edges is not None:
+            dist[name] = dist_ids[node_id]
+        if precedent_ids[node_id] != -1:
+            precedent[name] = names[precedent_ids[node_id]]
     return [dist, precedent]
 
 
@@ -86,3 +246,91 @@ def find_shortest_path(start: str, end: str, precedent: list[str, str]) -> list[
             return None
     shortest_path.append(start)
     return shortest_path
+
+
+def bidirectional_dijkstra(
+    graph: dict[str, dict[str, int]],
+    reverse: dict[str, dict[str, int]],
+    start: str,
+    end: str,
+) -> list[int, dict[str, str], dict[str, str], str]:
+    """Function wich implement a bidirectional dijkstra between two nodes.
+
+    A forward search from start on graph and a backward search from end on
+    reverse are expanded in turn, each time on the side whose frontier is the
+    closest. It stops once the sum of the two closest frontiers can't beat
+    the best path found so far. It returns [distance, precedent, successor, meeting]
+    where meeting is the node on which the two searches met, or [None, precedent, successor, None]
+    if there is no path."""
+    dist_forward, dist_backward = {start: 0}, {end: 0}
+    precedent, successor = {}, {}
+    heap_forward, heap_backward = [(0, start)], [(0, end)]
+    best, meeting = None, None
+    if start == end:
+        return [0, precedent, successor, start]
+    pops, settled, relaxations = 0, 0, 0
+    while heap_forward and heap_backward:
+        if best is not None and heap_forward[0][0] + heap_backward[0][0] >= best:
+            break
+        if heap_forward[0][0] <= heap_backward[0][0]:
+            heap, adjacency, dist, other, links = (
+                heap_forward,
+                graph,
+                dist_forward,
+                dist_backward,
+                precedent,
+            )
+        else:
+            heap, adjacency, dist, other, links = (
+                heap_backward,
+                reverse,
+                dist_backward,
+                dist_forward,
+                successor,
+            )
+        dist_1, node_1 = heappop(heap)
+        pops += 1
+        if dist_1 > dist[node_1]:
+            continue
+        settled += 1
+        for node_2, lenght in (adjacency.get(node_1) or {}).items():
+            dist_2 = dist_1 + lenght
+            if node_2 not in dist or dist_2 < dist[node_2]:
+                relaxations += 1
+                dist[node_2] = dist_2
+                links[node_2] = node_1
+                heappush(heap, (dist_2, node_2))
+            if node_2 in other and (
+                best is None or dist[node_2] + other[node_2] < best
+            ):
+                best = dist[node_2] + other[node_2]
+                meeting = node_2
+    if stats.enabled:
+        stats.count(
+            "bidirectional",
+            searches=1,
+            pushes=2 + relaxations,
+            pops=pops,
+            settled=settled,
+            relaxations=relaxations,
+        )
+    return [best, precedent, successor, meeting]
+
+
+def find_bidirectional_path(
+    start: str,
+    end: str,
+    meeting: str,
+    precedent: dict[str, str],
+    successor: dict[str, str],
+) -> list[str]:
+    """Function to stitch the path found by bidirectional_dijkstra() and return none if they are no path.
+    Like find_shortest_path() the path is returned from the end to the start"""
+    if meeting is None:
+        return None
+    forward = find_shortest_path(start, meeting, precedent)
+    backward = find_shortest_path(end, meeting, successor)
+    if forward is None or backward is None:
+        return None
+    backward.reverse()
+    return backward[:-1] + forward
@@ -0,0 +1,110 @@
+""" Incremental maintenance of a shortest path tree when one edge changes"""
+from collections import defaultdict
+from .dijkstra_ import MAX_VALUE, search_
+
+
+def insert_edge(
+    graph: dict[str, dict[str, int]],
+    dist: dict[str, int],
+    precedent: dict[str, str],
+    start: str,
+    end: str,
+    lenght: int,
+    reverse: dict[str, dict[str, int]] = None,
+) -> None:
+    """Function to add an edge to a graph and update in place the tree
+    [dist, precedent] computed by dijkstra() on that graph.
+
+    Only the nodes whose distance decreases thanks to the new edge are visited.
+    If the edge replaces a longer one nothing else is needed, if it replaces a
+    shorter one it is handled as a deletion followed by an insertion.
+    If the reverse graph from build_reverse_graph() is given it is kept in sync."""
+    lenght = int(lenght)
+    old_lenght = (graph.get(start) or {}).get(end)
+    if old_lenght is not None and old_lenght < lenght:
+        delete_edge(graph, dist, precedent, start, end, reverse)
+    if start not in graph:
+        graph[start] = {}
+    graph[start][end] = lenght
+    if reverse is not None:
+        if end not in reverse:
+            reverse[end] = {}
+        reverse[end][start] = lenght
+    dist.setdefault(start, MAX_VALUE)
+    dist.setdefault(end, MAX_VALUE)
+
+    dist_2 = dist[start] + lenght
+    if dist[start] < MAX_VALUE and dist_2 < dist[end]:
+        dist[end] = dist_2
+        precedent[end] = start
+        search_(graph, dist, precedent, [(dist_2, end)])
+
+
+def delete_edge(
+    graph: dict[str, dict[str, int]],
+    dist: dict[str, int],
+    precedent: dict[str, str],
+    start: str,
+    end: str,
+    reverse: dict[str, dict[str, int]] = None,
+) -> None:
+    """Function to remove an edge from a graph and update in place the tree
+    [dist, precedent] computed by dijkstra() on that graph.
+
+    If the edge is part of the tree, only the subtree hanging from its ending
+    node is recomputed, starting from the best edges entering the subtree
+    from the rest of the tree. Nodes which can't be reached anymore are left
+    at MAX_VALUE. If the reverse graph from build_reverse_graph() is given it
+    is kept in sync and used to find those edges, otherwise the whole graph is scanned.
+    """
+    neighbours = graph.get(start) or {}
+    if end not in neighbours:
+        return
+    del neighbours[end]
+    if not neighbours and start in graph:
+        del graph[start]
+    if reverse is not None:
+        del reverse[end][start]
+        if not reverse[end]:
+            del reverse[end]
+    if precedent.get(end) != start:
+        return
+
+    # Collect the subtree of end from the precedent links
+    children = defaultdict(list)
+    for node, parent in precedent.items():
+        children[parent].append(node)
+    affected = {end}
+    stack = [end]
+    while stack:
+        for child in children[stack.pop()]:
+            affected.add(child)
+            stack.append(child)
+    for node in affected:
+        dist[node] = MAX_VALUE
+        del precedent[node]
+
+    # Best entry point of every affected node from the unaffected part of the tree
+    if reverse is not None:
+        entries = (
+            (node_1, node_2, lenght)
+            for node_2 in affected
+            for node_1, lenght in (reverse.get(node_2) or {}).items()
+        )
+    else:
+        entries = (
+            (node_1, node_2, lenght)
+            for node_1, edges in graph.items()
+            for node_2, lenght in edges.items()
+            if node_2 in affected
+        )
+    heap = []
+    for node_1, node_2, lenght in entries:
+        if node_1 in affected or dist.get(node_1, MAX_VALUE) >= MAX_VALUE:
+            continue
+        if dist[node_1] + lenght < dist[node_2]:
+            dist[node_2] = dist[node_1] + lenght
+            precedent[node_2] = node_1
+            heap.append((dist[node_2], node_2))
+    heap.sort()
+    search_(graph, dist, precedent, heap)
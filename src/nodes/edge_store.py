@@ -0,0 +1,269 @@
+""" Access to the edges of a database, whatever the version of its structure"""
+from itertools import chain, islice
+from .schema import (
+    CompactStructure,
+    DatabaseStructure,
+    bump_graph_version,
+    create_indexes,
+    id_generator,
+    install_version_triggers,
+    remove_version_triggers,
+    structure_of,
+)
+from .sqlite3_wrapper import Database
+
+
+class EdgeStore:
+    """The edges of a database, by name.
+
+    With a DatabaseStructure the edges are rows of the Paths table keyed by
+    the id_generator() of their nodes. With a CompactStructure the names are
+    stored once in the Nodes table and the edges are integer pairs of the
+    Edges table. The methods of EdgeStore hide the difference, and the Paths
+    table or view can be read the same way in both cases."""
+
+    def __init__(self, db: Database, struct=None) -> None:
+        """The constructor of the EdgeStore class
+
+        @param db An opened Database.
+
+        @param struct Optionally, the structure of the tables, structure_of(db) by default.
+        """
+        self.db = db
+        self.struct = struct or structure_of(db)
+        self.compact = self.struct.VERSION == 2
+
+    @classmethod
+    def create(cls, db: Database, compact: bool = True) -> "EdgeStore":
+        """Function to create the tables, the indexes and the version triggers
+        of the edges
+
+        @param db An opened Database.
+
+        @param compact Whether to use a CompactStructure or a DatabaseStructure."""
+        if not compact:
+            struct = DatabaseStructure()
+            db.create_table(struct.TABLE_NAME, struct.COLUMNS)
+        else:
+            struct = CompactStructure()
+            db.create_table(struct.NODES_TABLE, struct.NODES_COLUMNS)
+            db.create_table(struct.EDGES_TABLE, struct.COLUMNS, "WITHOUT ROWID")
+            db.query(
+                f"CREATE VIEW IF NOT EXISTS {struct.TABLE_NAME} AS "
+                "SELECT start.Name AS Start, end_.Name AS End, edge.Length AS Length "
+                f"FROM {struct.EDGES_TABLE} AS edge "
+                f"JOIN {struct.NODES_TABLE} AS start ON start.ID = edge.Start "
+                f"JOIN {struct.NODES_TABLE} AS end_ ON end_.ID = edge.End"
+            )
+            db.create_table(struct.META_TABLE, struct.META_COLUMNS)
+            db.query(
+                f"INSERT OR REPLACE INTO {struct.META_TABLE} (Key, Value) "
+                f"VALUES ('schema_version', {struct.VERSION})"
+            )
+        create_indexes(db, struct)
+        install_version_triggers(db, struct)
+        return cls(db, struct)
+
+    def node_id_(self, name: str) -> int:
+        """Function to get the id of a node of a CompactStructure, or None"""
+        rows = self.db.select(self.struct.NODES_TABLE, "ID", "Name = ?", (name,))
+        return rows[0][0] if rows else None
+
+    def insert(self, start: str, end: str, lenght: int) -> None:
+        """Function to insert an edge, an sqlite3.IntegrityError being raised if
+        there is already one between the two nodes"""
+        if not self.compact:
+            self.db.write(
+                self.struct.TABLE_NAME,
+                self.struct.COLUMNS_NAMES,
+                [id_generator(start + end), start, end, lenght],
+            )
+            return
+        self.db.cursor.executemany(
+            f"INSERT OR IGNORE INTO {self.struct.NODES_TABLE} (Name) VALUES (?)",
+            ((start,), (end,)),
+        )
+        self.db.write(
+            self.struct.EDGES_TABLE,
+            self.struct.COLUMNS_NAMES,
+            [self.node_id_(start), self.node_id_(end), lenght],
+        )
+
+    def insert_many(
+        self, edges, batch_size: int = 10000, on_conflict: str = None
+    ) -> int:
+        """Function to insert many edges [start, end, length], batch_size at a
+        time, each batch in its own transaction like Database.write_many()
+
+        @param edges Any iterable of edges.
+
+        @param batch_size The number of edges per transaction.
+
+        @param on_conflict Optionally, "ignore" or "replace" an existing edge
+        between the same nodes.
+
+        @returns The number of edges read."""
+        if not self.compact:
+            rows = (
+                (id_generator(start + end), start, end, lenght)
+                for start, end, lenght in edges
+            )
+            return self.db.write_many(
+                self.struct.TABLE_NAME,
+                self.struct.COLUMNS_NAMES,
+                rows,
+                batch_size,
+                on_conflict,
+            )
+        verb = f"INSERT OR {on_conflict.upper()}" if on_conflict else "INSERT"
+        nodes, edges_table = self.struct.NODES_TABLE, self.struct.EDGES_TABLE
+        count = 0
+        edges = iter(edges)
+        while batch := list(islice(edges, batch_size)):
+            with self.db.transaction():
+                self.db.cursor.executemany(
+                    f"INSERT OR IGNORE INTO {nodes} (Name) VALUES (?)",
+                    (
+                        (name,)
+                        for name in chain.from_iterable(edge[:2] for edge in batch)
+                    ),
+                )
+                self.db.cursor.executemany(
+                    f"{verb} INTO {edges_table} (Start, End, Length) VALUES ("
+                    f"(SELECT ID FROM {nodes} WHERE Name = ?), "
+                    f"(SELECT ID FROM {nodes} WHERE Name = ?), ?)",
+                    batch,
+                )
+            count += len(batch)
+        return count
+
+    def delete(self, start: str, end: str) -> int:
+        """Function to delete the edge between two nodes
+
+        @returns The number of edges deleted, 0 or 1."""
+        if not self.compact:
+            self.db.delete_rows(
+                self.struct.TABLE_NAME, "ID = ?", (id_generator(start + end),)
+            )
+        else:
+            nodes = self.struct.NODES_TABLE
+            self.db.delete_rows(
+                self.struct.EDGES_TABLE,
+                f"Start = (SELECT ID FROM {nodes} WHERE Name = ?) "
+                f"AND End = (SELECT ID FROM {nodes} WHERE Name = ?)",
+                (start, end),
+            )
+        # rowcount ignores the rows changed by the version triggers
+        return self.db.cursor.rowcount
+
+    def edges(self, batch_size: int = 1000):
+        """Generator of the edges (start, end, length) by name"""
+        return self.db.stream(
+            self.struct.TABLE_NAME, "Start, End, Length", batch_size=batch_size
+        )
+
+    def page(
+        self, after: tuple[str, str] = None, limit: int = 50, prefix: str = ""
+    ) -> list[tuple[str, str, int]]:
+        """Function to get a page of edges ordered by start then end name.
+
+        The page is found by keyset pagination: it starts after the key of the
+        last edge of the previous page, so SQLite seeks it in the name index
+        instead of skipping the rows of every previous page like OFFSET would.
+
+        @param after Optionally, the (start, end) of the edge preceding the page.
+
+        @param limit The maximum number of edges of the page.
+
+        @param prefix Optionally, the beginning of the start names to keep.
+
+        @returns The edges (start, end, length) of the page."""
+        table, start, end = self.struct.TABLE_NAME, "Start", "End"
+        if self.compact:
+            # Without statistics SQLite would rather sort every edge than walk
+            # the names in order, CROSS JOIN makes it start from the names
+            nodes = self.struct.NODES_TABLE
+            table = (
+                f"{nodes} AS start CROSS JOIN {self.struct.EDGES_TABLE} AS edge "
+                f"ON edge.Start = start.ID JOIN {nodes} AS end_ ON end_.ID = edge.End"
+            )
+            start, end = "start.Name", "end_.Name"
+        conditions, parameters = ["1"], []
+        if after is not None:
+            conditions.append(f"({start}, {end}) > (?, ?)")
+            parameters.extend(after)
+        if prefix:
+            conditions.append(f"{start} >= ? AND {start} < ?")
+            parameters.extend((prefix, prefix + "\U0010ffff"))
+        return list(
+            self.db.stream(
+                table,
+                f"{start}, {end}, Length",
+                " AND ".join(conditions),
+                tuple(parameters),
+                order=f"{start}, {end}",
+                limit=limit,
+                batch_size=limit,
+            )
+        )
+
+    def neighbours(self, name: str, reverse: bool = False) -> dict[str, int]:
+        """Function to get the neighbours of a node, {'B': lenght,...}
+
+        @param reverse Whether to get the nodes having an edge to this one instead."""
+        source, target = ("End", "Start") if reverse else ("Start", "End")
+        return dict(
+            self.db.select(
+                self.struct.TABLE_NAME, f"{target}, Length", f"{source} = ?", (name,)
+            )
+        )
+
+    def count(self) -> int:
+        """Function to get the number of edges"""
+        return self.db.select(self.struct.EDGES_TABLE, "COUNT(*)", "1")[0][0]
+
+
+def migrate_to_compact(db: Database, keep: bool = False) -> int:
+    """Function to convert a database from a DatabaseStructure to a
+    CompactStructure.
+
+    The rows are copied by two INSERT ... SELECT statements run by SQLite,
+    so nothing is loaded in memory, and the whole migration is a single
+    transaction. The edge version is kept and incremented, the version
+    triggers being installed if they were not. An edge whose nodes are
+    already linked (an id_generator() collision) is skipped.
+
+    @param db An opened Database.
+
+    @param keep Whether to keep the old table, renamed Paths_V1.
+
+    @returns The number of edges migrated, 0 if the database is already compact."""
+    if structure_of(db).VERSION == 2:
+        return 0
+    old, new = DatabaseStructure(), CompactStructure()
+    with db.transaction():
+        db.create_table(old.TABLE_NAME, old.COLUMNS)
+        remove_version_triggers(db, old)
+        for index in chain((index for index, _ in old.INDEXES), old.OLD_INDEXES):
+            db.remove_index(index)
+        db.query(f"ALTER TABLE {old.TABLE_NAME} RENAME TO {old.TABLE_NAME}_V1")
+        EdgeStore.create(db, compact=True)
+        # The version is bumped once at the end rather than by every copied row
+        remove_version_triggers(db, new)
+        db.query(
+            f"INSERT OR IGNORE INTO {new.NODES_TABLE} (Name) "
+            f"SELECT Start FROM {old.TABLE_NAME}_V1 "
+            f"UNION SELECT End FROM {old.TABLE_NAME}_V1"
+        )
+        db.query(
+            f"INSERT OR IGNORE INTO {new.EDGES_TABLE} (Start, End, Length) "
+            "SELECT start.ID, end_.ID, path.Length "
+            f"FROM {old.TABLE_NAME}_V1 AS path "
+            f"JOIN {new.NODES_TABLE} AS start ON start.Name = path.Start "
+            f"JOIN {new.NODES_TABLE} AS end_ ON end_.Name = path.End"
+        )
+        if not keep:
+            db.remove_table(f"{old.TABLE_NAME}_V1")
+        install_version_triggers(db, new)
+        bump_graph_version(db, new)
+    return EdgeStore(db, new).count()
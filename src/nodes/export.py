@@ -0,0 +1,127 @@
+""" Streaming CSV export of tables, distance matrices and shortest paths"""
+import csv
+import sys
+from itertools import islice
+from .matrix import COLUMNS_NAMES as MATRIX_COLUMNS
+from .sqlite3_wrapper import Database
+
+PATHS_COLUMNS = ("Start", "End", "Length", "Path")
+
+
+def write_csv(
+    rows,
+    fname: str,
+    header: list[str] = None,
+    delimiter: str = ",",
+    chunk_size: int = 10000,
+    mode: str = "w",
+) -> int:
+    """Function to write rows to a CSV file, chunk_size rows at a time, so
+    the memory used does not depend on the number of rows.
+
+    @param rows Any iterable of rows, like Database.stream(), a generator or a
+    sqlite3 cursor whose column names are then the default header.
+
+    @param fname The file to write, - for the standard output.
+
+    @param header Optionally, the names of the columns written as first line.
+
+    @param delimiter The column delimiter.
+
+    @param chunk_size The number of rows written at a time.
+
+    @param mode "w" to replace the file, "a" to append to it.
+
+    @returns The number of rows written, the header excluded."""
+    if header is None and getattr(rows, "description", None):
+        header = [column[0] for column in rows.description]
+    file = (
+        sys.stdout if fname == "-" else open(fname, mode, encoding="utf-8", newline="")
+    )
+    try:
+        writer = csv.writer(file, delimiter=delimiter, lineterminator="\n")
+        if header is not None:
+            writer.writerow(header)
+        count = 0
+        rows = iter(rows)
+        while chunk := list(islice(rows, chunk_size)):
+            writer.writerows(chunk)
+            count += len(chunk)
+        return count
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+
+def export_table(
+    db: Database,
+    table: str,
+    fname: str,
+    columns: str = "*",
+    condition: str = None,
+    parameters: tuple = (),
+    order: str = None,
+    chunk_size: int = 10000,
+) -> int:
+    """Function to export a table, or some of its rows and columns, with its
+    column names as header.
+
+    @param db An opened Database.
+
+    @param table The name of the database's table to export.
+
+    @param fname The file to write, - for the standard output.
+
+    @param columns The string of columns, comma-separated, to export.
+
+    @param condition Optionally, a WHERE condition with ? placeholders.
+
+    @param parameters The values bound to the placeholders of the condition.
+
+    @param order Optionally, the ORDER BY clause.
+
+    @returns The number of rows written."""
+    cursor = db.conn.execute(f"SELECT {columns} FROM {table} LIMIT 0")
+    header = [column[0] for column in cursor.description]
+    cursor.close()
+    rows = db.stream(
+        table, columns, condition, parameters, order, batch_size=chunk_size
+    )
+    return write_csv(rows, fname, header, chunk_size=chunk_size)
+
+
+def export_matrix(rows, fname: str, chunk_size: int = 10000) -> int:
+    """Function to export the (start, end, length) rows of a distance matrix,
+    like the generator of distance_matrix()
+
+    @returns The number of rows written."""
+    return write_csv(rows, fname, MATRIX_COLUMNS, chunk_size=chunk_size)
+
+
+def path_rows_(paths):
+    """Generator of the CSV rows of (start, end, length, path) results, the
+    nodes of a path being joined by >"""
+    for start, end, lenght, path in paths:
+        yield start, end, lenght, ">".join(path or ())
+
+
+def export_paths(paths, fname: str, chunk_size: int = 10000) -> int:
+    """Function to export shortest paths.
+
+    @param paths Any iterable of (start, end, length, path), the path being
+    the list of nodes from start to end, or None if there is no path.
+
+    @returns The number of rows written."""
+    return write_csv(path_rows_(paths), fname, PATHS_COLUMNS, chunk_size=chunk_size)
+
+
+def tree_paths(start: str, dist: dict[str, int], precedent: dict[str, str]):
+    """Generator of the (start, end, length, path) shortest paths of a tree
+    computed by dijkstra(), to give to export_paths()"""
+    for end, lenght in dist.items():
+        path = [end]
+        while path[-1] != start and path[-1] in precedent:
+            path.append(precedent[path[-1]])
+        if path[-1] == start:
+            path.reverse()
+            yield start, end, lenght, path
@@ -0,0 +1,130 @@
+""" Streaming import of edge lists into the Paths table"""
+import csv
+import sys
+import time
+from .edge_store import EdgeStore
+from .schema import (
+    DatabaseStructure,
+    bump_graph_version,
+    create_indexes,
+    graph_version,
+    install_version_triggers,
+    remove_version_triggers,
+    structure_of,
+)
+from .sqlite3_wrapper import Database
+
+
+def read_edges(fname: str, delimiter: str = None, header: bool = False):
+    """Generator of the edges [start, end, length] of a CSV or TSV file.
+
+    @param fname The file to read, "-" for the standard input.
+
+    @param delimiter Optionally, the delimiter of the columns, a tab for
+    .tsv files and a comma otherwise.
+
+    @param header Whether the first line is a header to skip.
+
+    A line without a start, an end and an integer length is reported on the
+    standard error and skipped."""
+    if delimiter is None:
+        delimiter = "\t" if fname.endswith(".tsv") else ","
+    file = sys.stdin if fname == "-" else open(fname, newline="", encoding="utf-8")
+    try:
+        reader = csv.reader(file, delimiter=delimiter)
+        if header:
+            next(reader, None)
+        for row in reader:
+            if not row:
+                continue
+            try:
+                yield [row[0].strip(), row[1].strip(), int(row[2])]
+            except (IndexError, ValueError):
+                print(
+                    f"line {reader.line_num}: expected a start, an end and a length",
+                    file=sys.stderr,
+                )
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def import_edges(
+    db: Database,
+    edges,
+    struct: DatabaseStructure = None,
+    batch_size: int = 50000,
+    cache_size: int = 256,
+    progress=None,
+) -> int:
+    """Function to load edges [start, end, length] into the Paths table.
+
+    The load runs with the WAL journal, synchronous=NORMAL and a cache of
+    cache_size MiB, the previous settings being restored afterwards. The
+    secondary indexes of the table are dropped during the load and created
+    once all the rows are in, and so are the triggers
+    of the edge version, which is incremented once. Edges already in the
+    table (same nodes) are skipped. The tables are created if needed, with the
+    structure of struct.
+
+    @param db An opened Database.
+
+    @param edges Any iterable of edges, like the generator of read_edges().
+
+    @param struct Optionally, the structure of the table, structure_of(db) by default.
+
+    @param batch_size The number of rows per transaction.
+
+    @param cache_size The size of the page cache during the load, in MiB.
+
+    @param progress Optionally, a function called with (rows, seconds) every batch_size rows.
+
+    @returns The number of rows read."""
+    struct = struct or structure_of(db)
+    db.conn.commit()
+    settings = {
+        name: db.pragma(name)[0][0]
+        for name in ("journal_mode", "synchronous", "cache_size")
+    }
+    db.pragma("journal_mode", "WAL")
+    db.pragma("synchronous", "NORMAL")
+    db.pragma("cache_size", -1024 * cache_size)
+    try:
+        return load_(db, edges, struct, batch_size, progress)
+    finally:
+        db.conn.commit()
+        for name, value in settings.items():
+            db.pragma(name, value)
+
+
+def load_(
+    db: Database, edges, struct: DatabaseStructure, batch_size: int, progress
+) -> int:
+    """Function to load the edges once the settings of import_edges() are set"""
+    store = EdgeStore.create(db, compact=struct.VERSION == 2)
+    for index, _ in struct.INDEXES:
+        db.remove_index(index)
+    versioned = graph_version(db, struct) is not None
+    if versioned:
+        remove_version_triggers(db, struct)
+
+    count = 0
+    begin = time.perf_counter()
+
+    def rows():
+        nonlocal count
+        for start, end, lenght in edges:
+            count += 1
+            if progress is not None and count % batch_size == 0:
+                progress(count, time.perf_counter() - begin)
+            yield start, end, lenght
+
+    store.insert_many(rows(), batch_size=batch_size, on_conflict="ignore")
+    create_indexes(db, struct)
+    if versioned:
+        install_version_triggers(db, struct)
+        bump_graph_version(db, struct)
+    db.conn.commit()
+    if progress is not None:
+        progress(count, time.perf_counter() - begin)
+    return count
@@ -0,0 +1,220 @@
+""" A* search guided by landmarks lower bounds (ALT)"""
+from heapq import heappop, heappush
+from .dijkstra_ import dijkstra
+from .schema import graph_version, install_version_triggers, structure_of
+from .sqlite3_wrapper import Database
+from .stats import stats
+
+
+class Landmarks:
+    """Distances from and to a few landmark nodes of a graph.
+
+    For a landmark L, the triangle inequality gives two lower bounds of the
+    distance between a node v and a target t:
+    d(v, t) >= d(L, t) - d(L, v) and d(v, t) >= d(v, L) - d(t, L).
+    The best of those bounds over every landmark is used as the heuristic of
+    astar(). Only distances actually found by dijkstra() are stored, a missing
+    distance gives no bound. The edge version the distances were computed at is
+    stored with them, stale landmarks would give bounds which are not lower bounds."""
+
+    TABLE_NAME = "Landmarks"
+    COLUMNS = (
+        ("Landmark", "text", "NOT NULL"),
+        ("Node", "text", "NOT NULL"),
+        ("Forward", "integer"),
+        ("Backward", "integer"),
+    )
+    COLUMNS_NAMES = ("Landmark", "Node", "Forward", "Backward")
+    META_TABLE = "LandmarksMeta"
+    META_COLUMNS = (("Key", "text", "PRIMARY KEY"), ("Value", "integer"))
+
+    def __init__(
+        self,
+        landmarks: list[str],
+        forward: list[dict[str, int]],
+        backward: list[dict[str, int]],
+    ) -> None:
+        """The constructor of the Landmarks class
+
+        @param landmarks The names of the landmark nodes.
+
+        @param forward For every landmark L, the distances d(L, v).
+
+        @param backward For every landmark L, the distances d(v, L)."""
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+
+    @classmethod
+    def compute(
+        cls,
+        graph: dict[str, dict[str, int]],
+        reverse: dict[str, dict[str, int]],
+        landmarks: list[str],
+    ) -> "Landmarks":
+        """Function to compute the distances of the given landmarks with dijkstra()
+
+        @param graph The graph, as built by build_graph().
+
+        @param reverse The reverse graph, as built by build_reverse_graph().
+
+        @param landmarks The names of the landmark nodes."""
+        forward = [dijkstra(graph, landmark)[0] for landmark in landmarks]
+        backward = [dijkstra(reverse, landmark)[0] for landmark in landmarks]
+        return cls(list(landmarks), forward, backward)
+
+    @classmethod
+    def select(
+        cls,
+        graph: dict[str, dict[str, int]],
+        reverse: dict[str, dict[str, int]],
+        k: int = 8,
+    ) -> "Landmarks":
+        """Function to pick k landmarks with the farthest selection heuristic
+        and compute their distances.
+
+        The first landmark is the node the farthest from an arbitrary node, each
+        next one is the node whose closest landmark is the farthest.
+
+        @param k The number of landmarks to pick."""
+        nodes = list(graph.keys())
+        if not nodes:
+            return cls([], [], [])
+        farthest = dijkstra(graph, nodes[0])[0]
+        candidate = max(farthest, key=farthest.get)
+        landmarks, forward, backward = [], [], []
+        closest = {}
+        while len(landmarks) < k and candidate is not None:
+            landmarks.append(candidate)
+            forward.append(dijkstra(graph, candidate)[0])
+            backward.append(dijkstra(reverse, candidate)[0])
+            for dist in forward[-1], backward[-1]:
+                for node, value in dist.items():
+                    if value < closest.get(node, value + 1):
+                        closest[node] = value
+            remaining = [
+                node for node in closest if node not in landmarks and closest[node]
+            ]
+            candidate = max(remaining, key=closest.get) if remaining else None
+        return cls(landmarks, forward, backward)
+
+    def heuristic_(self, end: str):
+        """Function to build the lower bound function of the distance to end"""
+        bounds = [
+            (forward, forward.get(end), backward, backward.get(end))
+            for forward, backward in zip(self.forward, self.backward)
+        ]
+
+        def heuristic(node: str) -> int:
+            best = 0
+            for forward, forward_end, backward, backward_end in bounds:
+                if forward_end is not None and node in forward:
+                    best = max(best, forward_end - forward[node])
+                if backward_end is not None and node in backward:
+                    best = max(best, backward[node] - backward_end)
+            return best
+
+        return heuristic
+
+    def save(self, db: Database, version: int = None) -> None:
+        """Function to store the landmarks in a side table of the database,
+        replacing the previous ones
+
+        @param db An opened Database.
+
+        @param version Optionally, the edge version of the graph the landmarks
+        were computed on, the current one of the database by default."""
+        struct = structure_of(db)
+        if db.select("sqlite_master", "name", "name = ?", (struct.EDGES_TABLE,)):
+            install_version_triggers(db, struct)
+        if version is None:
+            version = graph_version(db)
+        db.remove_table(self.TABLE_NAME)
+        db.remove_table(self.META_TABLE)
+        db.create_table(self.TABLE_NAME, self.COLUMNS)
+        db.create_table(self.META_TABLE, self.META_COLUMNS)
+        db.write(self.META_TABLE, ("Key", "Value"), ("edge_version", version))
+        db.write_many(
+            self.TABLE_NAME,
+            self.COLUMNS_NAMES,
+            (
+                (landmark, node, forward.get(node), backward.get(node))
+                for landmark, forward, backward in zip(
+                    self.landmarks, self.forward, self.backward
+                )
+                for node in forward.keys() | backward.keys()
+            ),
+        )
+
+    @classmethod
+    def load(cls, db: Database) -> "Landmarks":
+        """Function to load the landmarks stored by save(), or None if there are
+        none or if the edges changed since they were computed
+
+        @param db An opened Database."""
+        for table in cls.TABLE_NAME, cls.META_TABLE:
+            if not db.select("sqlite_master", "name", "name = ?", (table,)):
+                return None
+        version = db.select(cls.META_TABLE, "Value", "Key = 'edge_version'")
+        if not version or version[0][0] != graph_version(db):
+            return None
+        index = {}
+        landmarks, forward, backward = [], [], []
+        for landmark, node, dist_forward, dist_backward in db.get(
+            cls.TABLE_NAME, ", ".join(cls.COLUMNS_NAMES)
+        ):
+            if landmark not in index:
+                index[landmark] = len(landmarks)
+                landmarks.append(landmark)
+                forward.append({})
+                backward.append({})
+            if dist_forward is not None:
+                forward[index[landmark]][node] = dist_forward
+            if dist_backward is not None:
+                backward[index[landmark]][node] = dist_backward
+        return cls(landmarks, forward, backward)
+
+
+def astar(
+    graph: dict[str, dict[str, int]],
+    start: str,
+    end: str,
+    landmarks: Landmarks,
+) -> list[int, dict[str, str]]:
+    """Function wich implement the A* algorithm with the landmarks lower bounds
+    as heuristic. It returns [distance, precedent], distance being None if
+    there is no path, and the path can be read with find_shortest_path()."""
+    heuristic = landmarks.heuristic_(end)
+    dist = {start: 0}
+    precedent = {}
+    # Ties are broken in favour of the nodes the farthest from start
+    heap = [(heuristic(start), 0, start)]
+    pops, settled, relaxations = 0, 0, 0
+    distance = None
+    while heap:
+        _, dist_1, node_1 = heappop(heap)
+        dist_1 = -dist_1
+        pops += 1
+        if dist_1 > dist[node_1]:
+            continue
+        if node_1 == end:
+            distance = dist_1
+            break
+        settled += 1
+        for node_2, lenght in (graph.get(node_1) or {}).items():
+            dist_2 = dist_1 + lenght
+            if node_2 not in dist or dist_2 < dist[node_2]:
+                relaxations += 1
+                dist[node_2] = dist_2
+                precedent[node_2] = node_1
+                heappush(heap, (dist_2 + heuristic(node_2), -dist_2, node_2))
+    if stats.enabled:
+        stats.count(
+            "astar",
+            searches=1,
+            pushes=1 + relaxations,
+            pops=pops,
+            settled=settled,
+            relaxations=relaxations,
+        )
+    return [distance, precedent]
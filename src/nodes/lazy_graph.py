@@ -0,0 +1,101 @@
+""" Graph whose adjacency is read from the database on demand"""
+from collections import OrderedDict
+from .schema import DatabaseStructure, create_indexes, structure_of
+from .sqlite3_wrapper import Database
+
+
+class LazyGraph:
+    """A graph read from the Paths table one node at a time.
+
+    The neighbours of a node are fetched with an indexed query the first time
+    they are needed and kept in a bounded least recently used cache, so the
+    edge table never has to fit in memory. The class behaves like the
+    read-only dictionary returned by build_graph(), {'A':{'B', lenght},...},
+    so it can be given to dijkstra() and the other searches.
+
+    The queries are covered by the indexes of ensure_indexes()."""
+
+    def __init__(
+        self,
+        db: Database,
+        struct: DatabaseStructure = None,
+        cache_size: int = 100000,
+        reverse: bool = False,
+    ) -> None:
+        """The constructor of the LazyGraph class
+
+        @param db An opened Database, it must stay open while the graph is used.
+
+        @param struct Optionally, the structure of the table, structure_of(db) by default.
+
+        @param cache_size The maximum number of adjacency lists kept in memory.
+
+        @param reverse Whether to read the reverse graph, every edge A->B becoming B->A.
+        """
+        self.db = db
+        self.struct = struct or structure_of(db)
+        self.cache_size = cache_size
+        self.is_reverse = reverse
+        self.source, self.target = ("End", "Start") if reverse else ("Start", "End")
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def ensure_indexes(db: Database, struct: DatabaseStructure = None) -> None:
+        """Function to create the covering indexes of the forward and reverse lookups"""
+        create_indexes(db, struct)
+
+    def reverse(self) -> "LazyGraph":
+        """Function to get the reverse graph, read from the same table"""
+        return LazyGraph(self.db, self.struct, self.cache_size, not self.is_reverse)
+
+    def get(self, name: str, default=None) -> dict[str, int]:
+        """Function to get the neighbours of a node, as build_graph() would"""
+        neighbours = self.cache.get(name)
+        if neighbours is None:
+            self.misses += 1
+            neighbours = dict(
+                self.db.select(
+                    self.struct.TABLE_NAME,
+                    f"{self.target}, Length",
+                    f"{self.source} = ?",
+                    (name,),
+                )
+            )
+            self.cache[name] = neighbours
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self.cache.move_to_end(name)
+        return neighbours or default
+
+    def __getitem__(self, name: str) -> dict[str, int]:
+        neighbours = self.get(name)
+        if neighbours is None:
+            raise KeyError(name)
+        return neighbours
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def keys(self):
+        """Generator of the nodes with at least one outgoing edge"""
+        for (name,) in self.db.stream(
+            self.struct.TABLE_NAME, f"DISTINCT {self.source}"
+        ):
+            yield name
+
+    def items(self):
+        """Generator of the nodes with at least one outgoing edge and their neighbours"""
+        for name in self.keys():
+            yield name, self[name]
+
+    def __iter__(self):
+        return self.keys()
+
+    def __len__(self) -> int:
+        return self.db.select(
+            self.struct.TABLE_NAME, f"COUNT(DISTINCT {self.source})", "1"
+        )[0][0]
@@ -0,0 +1,105 @@
+""" Many-to-many distance matrices computed over a pool of processes"""
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from .dijkstra_ import dijkstra
+from .sqlite3_wrapper import Database
+
+TABLE_NAME = "Distances"
+COLUMNS = (
+    ("Start", "text", "NOT NULL"),
+    ("End", "text", "NOT NULL"),
+    ("Length", "integer", "NOT NULL"),
+)
+COLUMNS_NAMES = ("Start", "End", "Length")
+
+# The graph of the worker processes, set once per process and never sent with a task
+graph_ = None
+
+
+def init_worker_(graph=None) -> None:
+    """Function to set the graph of a worker process. With the fork start
+    method the graph is inherited from the parent and nothing is given."""
+    global graph_
+    if graph is not None:
+        graph_ = graph
+
+
+def row_(source: str, targets: frozenset[str] = None) -> list[tuple[str, str, int]]:
+    """Function to compute the distances from one source in a worker process"""
+    dist = dijkstra(graph_, source)[0]
+    if targets is None:
+        return [(source, end, lenght) for end, lenght in dist.items()]
+    return [(source, end, dist[end]) for end in targets if end in dist]
+
+
+def distance_matrix(
+    graph: dict[str, dict[str, int]],
+    sources: list[str],
+    targets: list[str] = None,
+    workers: int = None,
+):
+    """Generator of the (start, end, length) distances between sources and targets.
+
+    The sources are spread over a pool of processes, each running dijkstra()
+    once per source. The graph is handed to the workers once: inherited when
+    fork is the start method of the platform, or the one set by the program,
+    otherwise pickled once per worker. Fork is never chosen by itself, as it
+    is unsafe on macOS and in a process running threads, like the GUI.
+    A CSRGraph is the best choice, its arrays stay shared between the forked
+    processes. At most two sources per worker are in flight so the memory
+    used does not depend on the number of sources. Unreachable pairs are skipped.
+
+    @param graph The graph, as built by build_graph() or a CSRGraph.
+
+    @param sources The starting nodes.
+
+    @param targets Optionally, the ending nodes, every reached node otherwise.
+
+    @param workers Optionally, the number of processes, the number of CPUs otherwise."""
+    global graph_
+    targets = frozenset(targets) if targets is not None else None
+    workers = workers or multiprocessing.cpu_count()
+    context = multiprocessing.get_context()
+    if context.get_start_method() == "fork":
+        graph_ = graph
+        initargs = ()
+    else:
+        initargs = (graph,)
+    sources = iter(sources)
+    try:
+        with ProcessPoolExecutor(workers, context, init_worker_, initargs) as pool:
+            pending = {
+                pool.submit(row_, source, targets)
+                for source in islice(sources, 2 * workers)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+                    for source in islice(sources, 1):
+                        pending.add(pool.submit(row_, source, targets))
+    finally:
+        graph_ = None
+
+
+def write_matrix(
+    db: Database,
+    rows,
+    table: str = TABLE_NAME,
+    batch_size: int = 10000,
+) -> int:
+    """Function to stream (start, end, length) rows into a table of the database
+    with Database.write_many(). The table is created if needed.
+
+    @param db An opened Database.
+
+    @param rows Any iterable of rows, like the generator of distance_matrix().
+
+    @param table The name of the table to write to.
+
+    @param batch_size The number of rows per batch.
+
+    @returns The number of rows written."""
+    db.create_table(table, COLUMNS)
+    return db.write_many(table, COLUMNS_NAMES, rows, batch_size)
@@ -0,0 +1,167 @@
+""" Index of the node names for the prefix and substring searches of the pickers"""
+from bisect import bisect_left
+from heapq import heapify, heappop
+
+
+def trigrams_(key: str) -> set[str]:
+    """Function to get the distinct three character slices of a key"""
+    return {key[position : position + 3] for position in range(len(key) - 2)}
+
+
+def smallest_(pairs: list[tuple[str, str]], limit: int, accept=None) -> list[str]:
+    """Function to get the names of the first accepted (key, name) pairs in
+    order, without sorting the pairs which are never reached"""
+    heapify(pairs)
+    result = []
+    while pairs and len(result) < limit:
+        name = heappop(pairs)[1]
+        if accept is None or accept(name):
+            result.append(name)
+    return result
+
+
+class NameIndex:
+    """An index of node names answering the top matches of a typed text.
+
+    The names are kept sorted by their case-folded key, so the names starting
+    with a text are a contiguous range found with bisect. The names containing
+    a text of at least three characters are found from the intersection of the
+    sets of names holding each of its trigrams, so neither search scans every
+    name. Prefix matches come first, then substring matches, each in order.
+
+    A search can be restricted to a subset of the names, e.g. the reachable
+    ones. When the subset is small its names are scanned directly, otherwise
+    the index is walked, skipping the names out of the subset."""
+
+    def __init__(self, names=()) -> None:
+        """The constructor of the NameIndex class
+
+        @param names Optionally, an iterable of the names to index, duplicates
+        being ignored."""
+        pairs = sorted({(name.casefold(), name) for name in names})
+        self.keys = [key for key, _ in pairs]
+        self.names = [name for _, name in pairs]
+        # Every trigram gives the (key, name) pairs holding it
+        self.trigrams = {}
+        for pair in pairs:
+            for trigram in trigrams_(pair[0]):
+                self.trigrams.setdefault(trigram, set()).add(pair)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.position_(name) is not None
+
+    def position_(self, name: str) -> int:
+        """Function to get the position of a name in the sorted lists, None if absent"""
+        key = name.casefold()
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.names[position] == name:
+                return position
+            position += 1
+        return None
+
+    def add(self, name: str) -> None:
+        """Function to add a name, doing nothing if it is already indexed"""
+        if name in self:
+            return
+        key = name.casefold()
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.names[position] > name:
+                break
+            position += 1
+        self.keys.insert(position, key)
+        self.names.insert(position, name)
+        for trigram in trigrams_(key):
+            self.trigrams.setdefault(trigram, set()).add((key, name))
+
+    def discard(self, name: str) -> None:
+        """Function to remove a name, doing nothing if it is not indexed"""
+        position = self.position_(name)
+        if position is None:
+            return
+        key = self.keys.pop(position)
+        del self.names[position]
+        for trigram in trigrams_(key):
+            pairs = self.trigrams.get(trigram)
+            if pairs is not None:
+                pairs.discard((key, name))
+                if not pairs:
+                    del self.trigrams[trigram]
+
+    def scanned_(self, within, limit: int) -> bool:
+        """Function to tell whether a subset is small enough to be scanned directly"""
+        return within is not None and len(within) ** 2 < limit * len(self)
+
+    def scan_(self, key: str, limit: int, accept, within, substring: bool) -> list[str]:
+        """Function to search the names of a small subset, without the index"""
+        starting, containing = [], []
+        for name in within:
+            name_key = name.casefold()
+            if name_key.startswith(key):
+                starting.append((name_key, name))
+            elif substring and key in name_key:
+                containing.append((name_key, name))
+        result = smallest_(starting, limit, accept)
+        return result + smallest_(containing, limit - len(result), accept)
+
+    def prefix(self, text: str, limit: int = 50, accept=None, within=None) -> list[str]:
+        """Function to get the names starting with a text, ignoring the case.
+
+        @param text The typed text, every name matching an empty text.
+
+        @param limit The maximum number of names returned.
+
+        @param accept Optionally, a function telling whether a name may be returned.
+
+        @param within Optionally, the collection of the indexed names to search.
+
+        @returns The first matching names in sorted order."""
+        key = text.casefold()
+        if self.scanned_(within, limit):
+            return self.scan_(key, limit, accept, within, False)
+        result = []
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and len(result) < limit:
+            if not self.keys[position].startswith(key):
+                break
+            name = self.names[position]
+            if (within is None or name in within) and (accept is None or accept(name)):
+                result.append(name)
+            position += 1
+        return result
+
+    def search(self, text: str, limit: int = 50, accept=None, within=None) -> list[str]:
+        """Function to get the names starting with, then containing, a text,
+        ignoring the case. Texts shorter than a trigram only match prefixes.
+
+        @param text The typed text, every name matching an empty text.
+
+        @param limit The maximum number of names returned.
+
+        @param accept Optionally, a function telling whether a name may be returned.
+
+        @param within Optionally, the collection of the indexed names to search.
+
+        @returns The matching names, prefix matches first."""
+        key = text.casefold()
+        if self.scanned_(within, limit):
+            return self.scan_(key, limit, accept, within, len(key) >= 3)
+        result = self.prefix(text, limit, accept, within)
+        if len(result) >= limit or len(key) < 3:
+            return result
+        sets = sorted(
+            (self.trigrams.get(trigram, set()) for trigram in trigrams_(key)), key=len
+        )
+        containing = [
+            pair
+            for pair in sets[0].intersection(*sets[1:])
+            if key in pair[0] and not pair[0].startswith(key)
+        ]
+        if within is not None:
+            accept_ = accept
+            accept = lambda name: name in within and (accept_ is None or accept_(name))
+        return result + smallest_(containing, limit - len(result), accept)
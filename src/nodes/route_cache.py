@@ -0,0 +1,240 @@
+""" Cache of the point to point shortest paths, kept in the database between sessions"""
+import json
+import sqlite3
+import time
+from .routing import shortest_path
+from .schema import graph_version, install_version_triggers
+from .sqlite3_wrapper import Database
+from .stats import stats
+
+
+class RouteCache:
+    """A table of the shortest paths already found, read before searching.
+
+    A route is keyed by its start and end and records the version of the
+    edges it was computed at, the version triggers of the database being
+    installed if needed. A route of an older version is stale: it is
+    searched again and replaced, keeping its number of hits so the most
+    requested pairs can be warmed up after the graph changed. A pair without
+    a path is cached too, with no length. When the table holds more than
+    maxsize routes the least recently used ones are evicted.
+
+    A cache is meant to be created once per database and reused: the table
+    is only created by the first route stored, so reading an empty cache
+    never writes to the database. The hits are counted in memory and written
+    in one batch by flush(), which put() and evict() do first, so reading a
+    cached route doesn't write either."""
+
+    TABLE_NAME = "Routes"
+    COLUMNS = (
+        ("Start", "text", "NOT NULL"),
+        ("End", "text", "NOT NULL"),
+        ("Version", "integer", "NOT NULL"),
+        ("Length", "integer"),
+        ("Path", "text"),
+        ("Hits", "integer", "NOT NULL"),
+        ("LastUsed", "real", "NOT NULL"),
+        ("PRIMARY KEY (Start, End)",),
+    )
+    INDEXES = (("Routes_LastUsed", "LastUsed"), ("Routes_Hits", "Hits"))
+    # The number of routes whose hits are buffered before they are flushed
+    FLUSH_SIZE = 1000
+
+    def __init__(self, db: Database, maxsize: int = 10000) -> None:
+        """The constructor of the RouteCache class
+
+        @param db An opened Database, it must stay open while the cache is used.
+
+        @param maxsize The maximum number of routes kept in the table."""
+        self.db = db
+        self.maxsize = maxsize
+        self.created = bool(
+            db.select("sqlite_master", "name", "name = ?", (self.TABLE_NAME,))
+        )
+        # The [hits, last use] of the routes read since the last flush
+        self.hits = {}
+
+    def create_(self) -> None:
+        """Function to create the table and the version triggers, if not done yet"""
+        if self.created:
+            return
+        install_version_triggers(self.db)
+        self.db.create_table(self.TABLE_NAME, self.COLUMNS)
+        for index, columns in self.INDEXES:
+            self.db.create_index(index, self.TABLE_NAME, columns)
+        self.created = True
+
+    def get(self, start: str, end: str) -> list[int, list[str]]:
+        """Function to get the cached route between two nodes, counting a hit.
+
+        @returns [distance, path] with the path from the end to the start like
+        shortest_path(), [None, None] if there is no path, or None if the route
+        is not cached or stale."""
+        rows = self.created and self.db.select(
+            self.TABLE_NAME,
+            "Length, Path",
+            "Start = ? AND End = ? AND Version = ?",
+            (start, end, graph_version(self.db)),
+        )
+        if not rows:
+            if stats.enabled:
+                stats.count("route_cache", misses=1)
+            return None
+        hits = self.hits.setdefault((start, end), [0, 0.0])
+        hits[0] += 1
+        hits[1] = time.time()
+        if len(self.hits) >= self.FLUSH_SIZE:
+            self.flush()
+        if stats.enabled:
+            stats.count("route_cache", hits=1)
+        distance, path = rows[0]
+        if path is None:
+            return [None, None]
+        path = json.loads(path)
+        path.reverse()
+        return [distance, path]
+
+    def put(
+        self,
+        start: str,
+        end: str,
+        distance: int,
+        path: list[str],
+        hit: bool = True,
+        version: int = None,
+    ) -> None:
+        """Function to store the route between two nodes, then evict the least
+        recently used routes beyond maxsize
+
+        @param distance, path The result of shortest_path(), the path going from
+        the end to the start, or None and None if there is no path.
+
+        @param hit Whether the route was requested, counting a hit, or only warmed up.
+
+        @param version Optionally, the edge version of the graph the route was
+        found on, the current one of the database by default."""
+        if version is None:
+            version = graph_version(self.db)
+        if path is not None:
+            path = json.dumps(path[::-1])
+        with self.db.transaction():
+            self.create_()
+            self.db.cursor.execute(
+                f"INSERT INTO {self.TABLE_NAME} "
+                "(Start, End, Version, Length, Path, Hits, LastUsed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (Start, End) DO UPDATE SET "
+                "Version = excluded.Version, Length = excluded.Length, "
+                "Path = excluded.Path, Hits = Hits + excluded.Hits, "
+                "LastUsed = excluded.LastUsed",
+                (
+                    start,
+                    end,
+                    version,
+                    distance,
+                    path,
+                    int(hit),
+                    time.time(),
+                ),
+            )
+            self.evict()
+
+    def flush_(self) -> None:
+        """Function to write the buffered hits, in the current transaction"""
+        if self.hits:
+            self.db.cursor.executemany(
+                f"UPDATE {self.TABLE_NAME} SET Hits = Hits + ?, "
+                "LastUsed = MAX(LastUsed, ?) WHERE Start = ? AND End = ?",
+                [
+                    (count, used, start, end)
+                    for (start, end), (count, used) in self.hits.items()
+                ],
+            )
+            self.hits.clear()
+
+    def flush(self) -> None:
+        """Function to write the hits counted by get() in a single transaction.
+
+        The hits only order the evictions and the warm-ups, so they are dropped
+        if the database can't be written, e.g. if it is read-only or locked."""
+        try:
+            with self.db.transaction():
+                self.flush_()
+        except sqlite3.OperationalError:
+            self.hits.clear()
+
+    def evict(self, maxsize: int = None) -> int:
+        """Function to delete the least recently used routes beyond a size,
+        once the buffered hits are written
+
+        @param maxsize Optionally, the number of routes to keep, self.maxsize by default.
+
+        @returns The number of routes deleted."""
+        maxsize = self.maxsize if maxsize is None else maxsize
+        self.flush_()
+        self.db.cursor.execute(
+            f"DELETE FROM {self.TABLE_NAME} WHERE rowid IN ("
+            f"SELECT rowid FROM {self.TABLE_NAME} "
+            "ORDER BY LastUsed DESC LIMIT -1 OFFSET ?)",
+            (maxsize,),
+        )
+        return self.db.cursor.rowcount
+
+    def route(
+        self,
+        graph: dict[str, dict[str, int]],
+        reverse: dict[str, dict[str, int]],
+        start: str,
+        end: str,
+        hierarchy=None,
+        landmarks=None,
+        version: int = None,
+    ) -> list[int, list[str]]:
+        """Function to find the shortest path between two nodes like
+        shortest_path(), from the cache if it holds an up to date route,
+        otherwise searching it and caching the result.
+
+        @param version Optionally, the edge version the graph matches, the
+        current one of the database by default. A route found on an older graph
+        is then cached as stale instead of at the wrong version."""
+        result = self.get(start, end)
+        if result is None:
+            result = shortest_path(graph, reverse, start, end, hierarchy, landmarks)
+            self.put(start, end, *result, version=version)
+        return result
+
+    def warm(
+        self,
+        graph: dict[str, dict[str, int]],
+        reverse: dict[str, dict[str, int]],
+        count: int = 100,
+        hierarchy=None,
+        landmarks=None,
+    ) -> int:
+        """Function to search again the stale routes among the most requested ones
+
+        @param count The number of most requested routes to keep up to date.
+
+        @returns The number of routes searched."""
+        if not self.created:
+            return 0
+        self.flush()
+        version = graph_version(self.db)
+        stale = [
+            (start, end)
+            for start, end, route_version in self.db.stream(
+                self.TABLE_NAME,
+                "Start, End, Version",
+                order="Hits DESC",
+                limit=count,
+            )
+            if route_version != version
+        ]
+        for start, end in stale:
+            result = shortest_path(graph, reverse, start, end, hierarchy, landmarks)
+            self.put(start, end, *result, hit=False)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Function to delete every cached route"""
+        if self.created:
+            self.db.delete_rows(self.TABLE_NAME, "1")
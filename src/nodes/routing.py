@@ -0,0 +1,45 @@
+""" Choice of the search engine answering a point to point query"""
+from .contraction import ContractionHierarchy
+from .dijkstra_ import (
+    bidirectional_dijkstra,
+    find_bidirectional_path,
+    find_shortest_path,
+)
+from .landmarks import Landmarks, astar
+
+
+def shortest_path(
+    graph: dict[str, dict[str, int]],
+    reverse: dict[str, dict[str, int]],
+    start: str,
+    end: str,
+    hierarchy: ContractionHierarchy = None,
+    landmarks: Landmarks = None,
+) -> list[int, list[str]]:
+    """Function to find the shortest path between two nodes with the fastest
+    engine available: the contraction hierarchy, else A* with the landmarks,
+    else the bidirectional dijkstra.
+
+    It returns [distance, path] with the path from the end to the start,
+    like find_shortest_path(), or [None, None] if there is no path.
+
+    @param graph The graph, as built by build_graph(), a CSRGraph or a LazyGraph.
+
+    @param reverse The reverse graph, as built by build_reverse_graph().
+
+    @param hierarchy Optionally, an up to date ContractionHierarchy of the graph.
+
+    @param landmarks Optionally, up to date Landmarks of the graph."""
+    if hierarchy is not None:
+        return hierarchy.query(start, end)
+    if landmarks is not None:
+        distance, precedent = astar(graph, start, end, landmarks)
+        path = find_shortest_path(start, end, precedent)
+    else:
+        distance, precedent, successor, meeting = bidirectional_dijkstra(
+            graph, reverse, start, end
+        )
+        path = find_bidirectional_path(start, end, meeting, precedent, successor)
+    if path is None:
+        return [None, None]
+    return [distance, path]
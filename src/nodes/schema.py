@@ -0,0 +1,164 @@
+""" Structure of the tables holding the paths of a map"""
+from dataclasses import dataclass, field
+from hashlib import sha256
+
+
+@dataclass(slots=True)
+class DatabaseStructure:
+    TABLE_NAME: str = field(default="Paths", init=False, repr=False)
+    # The table whose rows are the edges, the one the triggers watch
+    EDGES_TABLE: str = field(default="Paths", init=False, repr=False)
+    COLUMNS: tuple[tuple[str]] = (
+        ("ID", "text", "PRIMARY KEY"),
+        ("Start", "text", "NOT NULL"),
+        ("End", "text", "NOT NULL"),
+        ("Length", "integer", "NOT NULL"),
+    )
+    COLUMNS_NAMES: list[str] = ("ID", "Start", "End", "Length")
+    INDEXES: tuple[tuple[str]] = (
+        ("Paths_Forward", "Start, End, Length"),
+        ("Paths_Backward", "End, Start, Length"),
+    )
+    # The indexes replaced by INDEXES, still found in older files
+    OLD_INDEXES: tuple[str] = ("Paths_Start", "Paths_End")
+    META_TABLE: str = field(default="Meta", init=False, repr=False)
+    META_COLUMNS: tuple[tuple[str]] = (
+        ("Key", "text", "PRIMARY KEY"),
+        ("Value", "integer", "NOT NULL"),
+    )
+    VERSION: int = field(default=1, init=False, repr=False)
+
+
+@dataclass(slots=True)
+class CompactStructure:
+    """Version 2 of the structure: every node name is stored once in the Nodes
+    table and the edges are keyed by integer pairs. TABLE_NAME is a view giving
+    the Start, End and Length of the edges by name, like the Paths table of
+    version 1, so the code reading the paths works on both."""
+
+    TABLE_NAME: str = field(default="Paths", init=False, repr=False)
+    EDGES_TABLE: str = field(default="Edges", init=False, repr=False)
+    NODES_TABLE: str = field(default="Nodes", init=False, repr=False)
+    NODES_COLUMNS: tuple[tuple[str]] = (
+        ("ID", "integer", "PRIMARY KEY"),
+        ("Name", "text", "NOT NULL UNIQUE"),
+    )
+    COLUMNS: tuple[tuple[str]] = (
+        ("Start", "integer", "NOT NULL"),
+        ("End", "integer", "NOT NULL"),
+        ("Length", "integer", "NOT NULL"),
+        ("PRIMARY KEY (Start, End)",),
+    )
+    COLUMNS_NAMES: list[str] = ("Start", "End", "Length")
+    INDEXES: tuple[tuple[str]] = (("Edges_Backward", "End, Start, Length"),)
+    OLD_INDEXES: tuple[str] = ()
+    META_TABLE: str = field(default="Meta", init=False, repr=False)
+    META_COLUMNS: tuple[tuple[str]] = (
+        ("Key", "text", "PRIMARY KEY"),
+        ("Value", "integer", "NOT NULL"),
+    )
+    VERSION: int = field(default=2, init=False, repr=False)
+
+
+def schema_version(db) -> int:
+    """
+    Function to get the version of the structure of a database
+    @param db An opened Database
+    @returns 2 for a CompactStructure, 1 for a DatabaseStructure
+    """
+    if not db.select("sqlite_master", "name", "name = ?", ("Meta",)):
+        return 1
+    version = db.select("Meta", "Value", "Key = 'schema_version'")
+    return version[0][0] if version else 1
+
+
+def structure_of(db):
+    """
+    Function to get the structure of the tables of a database
+    @param db An opened Database
+    @returns A CompactStructure or a DatabaseStructure
+    """
+    return CompactStructure() if schema_version(db) == 2 else DatabaseStructure()
+
+
+def id_generator(input_string: str) -> int:
+    """
+    Function to generate a unique id for a given string
+    @param input The string to generate an id for
+    @returns The id for the given string
+    """
+    return sha256(input_string.encode("utf-8")).hexdigest()
+
+
+def create_indexes(db, struct: DatabaseStructure = None) -> None:
+    """
+    Function to create the indexes of the edges, removing the older indexes
+    they replace
+    @param db An opened Database
+    @param struct Optionally, the structure of the table, structure_of(db) by default
+    """
+    struct = struct or structure_of(db)
+    for index in struct.OLD_INDEXES:
+        db.remove_index(index)
+    for index, columns in struct.INDEXES:
+        db.create_index(index, struct.EDGES_TABLE, columns)
+
+
+def install_version_triggers(db, struct: DatabaseStructure = None) -> None:
+    """
+    Function to keep a version of the edges of a database, incremented by
+    triggers every time a row of the paths table is inserted, deleted or updated
+    @param db An opened Database
+    @param struct Optionally, the structure of the table, structure_of(db) by default
+    """
+    struct = struct or structure_of(db)
+    db.create_table(struct.META_TABLE, struct.META_COLUMNS)
+    db.query(
+        f"INSERT OR IGNORE INTO {struct.META_TABLE} (Key, Value) "
+        "VALUES ('edge_version', 0)"
+    )
+    for event in ("INSERT", "DELETE", "UPDATE"):
+        db.query(
+            f"CREATE TRIGGER IF NOT EXISTS {struct.EDGES_TABLE}_Version_{event} "
+            f"AFTER {event} ON {struct.EDGES_TABLE} BEGIN "
+            f"UPDATE {struct.META_TABLE} SET Value = Value + 1 "
+            "WHERE Key = 'edge_version'; END"
+        )
+
+
+def remove_version_triggers(db, struct: DatabaseStructure = None) -> None:
+    """
+    Function to remove the triggers of install_version_triggers(), the version
+    itself is kept
+    @param db An opened Database
+    @param struct Optionally, the structure of the table, structure_of(db) by default
+    """
+    struct = struct or structure_of(db)
+    for event in ("INSERT", "DELETE", "UPDATE"):
+        db.query(f"DROP TRIGGER IF EXISTS {struct.EDGES_TABLE}_Version_{event}")
+
+
+def bump_graph_version(db, struct: DatabaseStructure = None) -> None:
+    """
+    Function to increment the version of the edges of a database by hand
+    @param db An opened Database
+    @param struct Optionally, the structure of the table, DatabaseStructure() by default
+    """
+    struct = struct or DatabaseStructure()
+    db.query(
+        f"UPDATE {struct.META_TABLE} SET Value = Value + 1 WHERE Key = 'edge_version'"
+    )
+
+
+def graph_version(db, struct: DatabaseStructure = None) -> int:
+    """
+    Function to get the version of the edges of a database
+    @param db An opened Database
+    @param struct Optionally, the structure of the table, DatabaseStructure() by default
+    @returns The version, or None if install_version_triggers() was never called
+    """
+    struct = struct or DatabaseStructure()
+    if not db.select("sqlite_master", "name", "name = ?", (struct.META_TABLE,)):
+        return None
+    version = db.select(struct.META_TABLE, "Value", "Key = 'edge_version'")
+    return version[0][0] if version else None
@@ -0,0 +1,121 @@
+""" Memory-mapped binary snapshot of the graph of a database"""
+import mmap
+import os
+import struct as binary
+from .csr_graph import CSRGraph
+from .schema import DatabaseStructure, graph_version, structure_of
+from .sqlite3_wrapper import Database
+
+MAGIC = b"ODYSNAP2"
+# node count, edge count, edge version (-1 without the version triggers), size
+# of the names without their padding
+HEADER = binary.Struct("<8sqqqq")
+
+
+def snapshot_name(db: Database) -> str:
+    """Function to get the name of the snapshot file of a database"""
+    return f"{db.name}.graph"
+
+
+def write_snapshot(
+    db: Database, fname: str = None, struct: DatabaseStructure = None
+) -> CSRGraph:
+    """Function to compile the paths of a database into a snapshot file.
+
+    The file holds a header, the node names separated by NUL bytes and the
+    offsets, targets and weights arrays of the CSRGraph, each aligned on 8
+    bytes. The header records the edge count and the edge version of the
+    database, if it has the version triggers.
+
+    @param db An opened Database.
+
+    @param fname Optionally, the snapshot file, snapshot_name() by default.
+
+    @param struct Optionally, the structure of the table, structure_of(db) by default.
+
+    @returns The graph written to the file."""
+    struct = struct or structure_of(db)
+    fname = fname or snapshot_name(db)
+    version = graph_version(db, struct)
+    graph = CSRGraph.from_edges(db.stream(struct.TABLE_NAME, "Start, End, Length"))
+    names = "\0".join(graph.names).encode("utf-8")
+    header = HEADER.pack(
+        MAGIC,
+        graph.node_count,
+        graph.edge_count,
+        -1 if version is None else version,
+        len(names),
+    )
+    with open(f"{fname}.tmp", "wb") as file:
+        file.write(header)
+        file.write(names + bytes(-len(names) % 8))
+        for values in graph.offsets, graph.targets, graph.weights:
+            values.tofile(file)
+    os.replace(f"{fname}.tmp", fname)
+    return graph
+
+
+def read_snapshot(fname: str) -> tuple[CSRGraph, int]:
+    """Function to open a snapshot file without copying its arrays.
+
+    The arrays of the returned graph are read-only views of the memory-mapped
+    file, only the names are decoded. The file stays mapped until the graph is
+    closed or garbage collected.
+
+    @param fname The snapshot file.
+
+    @returns The graph and the edge version it was written at, None if the
+    database had no version triggers, or (None, None) if the file does not
+    exist or is not a snapshot."""
+    try:
+        with open(fname, "rb") as file:
+            content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None, None
+    if len(content) < HEADER.size or content[:8] != MAGIC:
+        content.close()
+        return None, None
+    _, node_count, edge_count, version, names_size = HEADER.unpack_from(content)
+    position = HEADER.size
+    with memoryview(content) as view:
+        names = str(view[position : position + names_size], "utf-8")
+        position += names_size + -names_size % 8
+        arrays = []
+        for count in node_count + 1, edge_count, edge_count:
+            arrays.append(view[position : position + 8 * count].cast("q"))
+            position += 8 * count
+    names = names.split("\0") if node_count else []
+    return CSRGraph(names, *arrays, content), None if version == -1 else version
+
+
+def load_snapshot(
+    db: Database, fname: str = None, struct: DatabaseStructure = None
+) -> CSRGraph:
+    """Function to get the graph of a database from its snapshot file.
+
+    The snapshot is used if its edge count and edge version match the
+    database, otherwise it is rebuilt with write_snapshot() first. Nothing is
+    written to the database: without the version triggers, only the edge
+    counts are compared.
+
+    @param db An opened Database.
+
+    @param fname Optionally, the snapshot file, snapshot_name() by default.
+
+    @param struct Optionally, the structure of the table, structure_of(db) by default.
+    """
+    struct = struct or structure_of(db)
+    fname = fname or snapshot_name(db)
+    graph, version = read_snapshot(fname)
+    edge_version = graph_version(db, struct)
+    if (
+        graph is None
+        or (edge_version is not None and version != edge_version)
+        or graph.edge_count != db.select(struct.EDGES_TABLE, "COUNT(*)", "1")[0][0]
+    ):
+        # The stale file is unmapped first, it can't be replaced while mapped on Windows
+        if graph is not None:
+            graph.close()
+        write_snapshot(db, fname, struct)
+        graph, version = read_snapshot(fname)
+    return graph
@@ -1,6 +1,77 @@
 """@file sqlite3_wrapper.py"""
 
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from .aggregate import summarize_rows
+from .stats import timed
+
+
+class ConnectionManager:
+    """A pool of long-lived sqlite3 connections.
+
+    The ConnectionManager keeps one connection, and one cursor, per database
+    path and per thread, since a sqlite3 connection can only be used by the
+    thread which created it. Every Database opened on the same path from the
+    same thread shares them, so the file is opened once and the statements
+    cached by the connection are reused. In-memory and temporary databases
+    are never shared.
+
+    The connections of a thread are kept in a threading.local, so a new thread
+    never gets those of a finished one, and are left to the thread to close:
+    a thread opening databases, like a background worker, calls close()
+    before it ends."""
+
+    def __init__(self, cached_statements: int = 256) -> None:
+        """The constructor of the ConnectionManager class
+
+        @param cached_statements The number of statements kept per connection."""
+        self.cached_statements = cached_statements
+        self.local = threading.local()
+
+    @staticmethod
+    def shareable(name: str) -> bool:
+        """Function to know whether a database can be shared, in-memory and
+        temporary databases can't
+
+        @param name The name of the database."""
+        return name not in ("", ":memory:") and not name.startswith("file:")
+
+    @property
+    def connections(self) -> dict[str, tuple[sqlite3.Connection, sqlite3.Cursor]]:
+        """The connections of the current thread, by the absolute path of their database"""
+        if not hasattr(self.local, "connections"):
+            self.local.connections = {}
+        return self.local.connections
+
+    def connect(self, name: str) -> tuple[sqlite3.Connection, sqlite3.Cursor]:
+        """Function to get the connection and the cursor of a database for
+        the current thread, opening it if needed
+
+        @param name The name of the database to open."""
+        key = os.path.abspath(name)
+        if key not in self.connections:
+            conn = sqlite3.connect(name, cached_statements=self.cached_statements)
+            self.connections[key] = (conn, conn.cursor())
+        return self.connections[key]
+
+    def close(self, name: str = None) -> None:
+        """Function to commit and close the connections of the current thread
+
+        @param name Optionally, the database to close, all of them otherwise."""
+        keys = list(self.connections) if name is None else [os.path.abspath(name)]
+        for key in keys:
+            if key in self.connections:
+                conn, cursor = self.connections.pop(key)
+                conn.commit()
+                cursor.close()
+                conn.close()
+
+
+# The connections shared by every Database
+connections = ConnectionManager()
 
 
 class Database:
@@ -12,14 +83,16 @@ class Database:
     only the very last item in the database, toCSV(), which writes
     entries from a database to a CSV file, and summary(), a function
     that takes a dataset and returns only the maximum, minimum and
-    average for each column. The Database can be opened either by passing
+    average for each column, or summarize() which does it in SQL. The
+    Database can be opened either by passing
     on the name of the sqlite database in the constructor, or optionally
     after constructing the database without a name first, the open()
     method can be used. Additionally, the Database can be opened as a
     context method, using a 'with .. as' statement. The latter takes
-    care of closing the database."""
+    care of closing the database. The calls of its methods are timed in
+    nodes.stats while it is enabled."""
 
-    def __init__(self, name: str = None) -> None:
+    def __init__(self, name: str = None, shared: bool = True) -> None:
         """The constructor of the Database class
 
         The constructor can either be passed the name of the database to open
@@ -28,14 +101,20 @@ class Database:
 
         @param name Optionally, the name of the database to open.
 
+        @param shared Whether to use the long-lived connection of the
+        ConnectionManager instead of a connection of its own.
+
         @see open()"""
 
+        self.name = None
         self.conn = None
         self.cursor = None
+        self.shared = shared
 
         if name:
             self.open(name)
 
+    @timed
     def open(self, name: str) -> None:
         """Opens a new database connection.
 
@@ -45,9 +124,15 @@ class Database:
         @param name The name of the database to open.
 
         @see \__init\__()"""
-        self.conn = sqlite3.connect(name)
-        self.cursor = self.conn.cursor()
-
+        self.name = name
+        self.shared = self.shared and connections.shareable(name)
+        if self.shared:
+            self.conn, self.cursor = connections.connect(name)
+        else:
+            self.conn = sqlite3.connect(name)
+            self.cursor = self.conn.cursor()
+
+    @timed
     def close(self):
         """Function to close a database connection.
 
@@ -58,14 +143,18 @@ class Database:
         constructor ( \__init\__() ), you must close the connection with this
         method.
 
+        A shared connection is only committed, it stays open for the next
+        Database opened on the same file and is closed by ConnectionManager.close().
+
         @see open()
 
         @see \__init\__()"""
 
         if self.conn:
             self.conn.commit()
-            self.cursor.close()
-            self.conn.close()
+            if not self.shared:
+                self.cursor.close()
+                self.conn.close()
 
     def __enter__(self):
 
@@ -75,6 +164,34 @@ class Database:
 
         self.close()
 
+    @contextmanager
+    def transaction(self):
+        """Context manager of an explicit transaction.
+
+        The changes made inside the 'with' block are committed at its end, or
+        rolled back if an exception is raised. Inside another transaction, a
+        savepoint is used instead so only the inner changes are rolled back."""
+
+        if self.conn.in_transaction:
+            savepoint = f"savepoint_{id(self)}_{threading.get_ident()}"
+            self.cursor.execute(f"SAVEPOINT {savepoint}")
+            try:
+                yield self
+            except BaseException:
+                self.cursor.execute(f"ROLLBACK TO {savepoint}")
+                self.cursor.execute(f"RELEASE {savepoint}")
+                raise
+            self.cursor.execute(f"RELEASE {savepoint}")
+        else:
+            self.cursor.execute("BEGIN")
+            try:
+                yield self
+            except BaseException:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+
+    @timed
     def get(self, table: str, columns: str, limit: str = None) -> list[str]:
         """Function to fetch/query data from a database.
 
@@ -84,15 +201,83 @@ class Database:
 
         @param columns The string of columns, comma-separated, to fetch.
 
-        @param limit Optionally, a limit of items to fetch."""
+        @param limit Optionally, a limit of items to fetch, the last ones inserted,
+        or the last ones in the order of row_key_() for a table without rowid or a view.
+        """
+
+        if not limit:
+            return list(self.stream(table, columns))
+
+        order = ", ".join(f"{column} DESC" for column in self.row_key_(table))
+        rows = list(self.stream(table, columns, order=order, limit=int(limit)))
+        rows.reverse()
+        return rows
+
+    def row_key_(self, table: str) -> list[str]:
+        """Function to get the columns ordering the rows of a table: its rowid
+        if it has one, otherwise its primary key, or every column of a view"""
+        kind = self.select("sqlite_master", "type, sql", "name = ?", (table,))
+        if not kind or (
+            kind[0][0] == "table" and "WITHOUT ROWID" not in kind[0][1].upper()
+        ):
+            return ["rowid"]
+        info = self.pragma(f"table_info({table})")
+        primary = [row[1] for row in sorted(info, key=lambda row: row[5]) if row[5]]
+        return primary or [row[1] for row in info]
+
+    @timed
+    def stream(
+        self,
+        table: str,
+        columns: str,
+        condition: str = None,
+        parameters: tuple = (),
+        order: str = None,
+        limit: int = None,
+        offset: int = None,
+        batch_size: int = 1000,
+    ):
+        """Generator to fetch/query data from a database without loading it all.
+
+        The rows are fetched batch_size at a time with their own cursor, so
+        the database can still be used while the generator is running. The
+        condition, order, limit and offset are all done by SQLite.
 
-        query = f"SELECT {columns} from {table};"
-        self.cursor.execute(query)
+        @param table The name of the database's table to query from.
+
+        @param columns The string of columns, comma-separated, to fetch.
+
+        @param condition Optionally, a WHERE condition with ? placeholders.
+
+        @param parameters The values bound to the placeholders of the condition.
+
+        @param order Optionally, the ORDER BY clause.
+
+        @param limit Optionally, the maximum number of rows to fetch.
+
+        @param offset Optionally, the number of rows to skip.
 
-        rows = self.cursor.fetchall()
+        @param batch_size The number of rows fetched at a time."""
 
-        return rows[len(rows) - limit if limit else 0 :]
+        query = f"SELECT {columns} FROM {table}"
+        parameters = list(parameters)
+        if condition:
+            query += f" WHERE {condition}"
+        if order:
+            query += f" ORDER BY {order}"
+        if limit is not None or offset is not None:
+            query += " LIMIT ? OFFSET ?"
+            parameters += [-1 if limit is None else limit, offset or 0]
 
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, parameters)
+            while rows := cursor.fetchmany(batch_size):
+                yield from rows
+        finally:
+            cursor.close()
+
+    @timed
     def get_last(self, table: str, columns: str) -> list[str]:
         """Utilty function to get the last row of data from a database.
 
@@ -103,18 +288,26 @@ class Database:
         return self.get(table, columns, limit=1)[0]
 
     @staticmethod
-    def to_csv(data, fname: str = "output.csv") -> None:
+    def to_csv(data, fname: str = "output.csv", header: list[str] = None) -> None:
         """Utility function that converts a dataset into CSV format.
 
-        @param data The data, retrieved from the get() function.
+        The rows are appended to the file one per line, a chunk at a time.
+
+        @param data The data, retrieved from the get() or the stream() function.
 
         @param fname The file name to store the data in.
 
-        @see get()"""
+        @param header Optionally, the names of the columns written first.
+
+        @see get()
+
+        @see nodes.export"""
+        # imported here as the export module depends on this one
+        from .export import write_csv
 
-        with open(fname, "a", encoding="utf-8") as file:
-            file.write(",".join([str(j) for i in data for j in i]))
+        write_csv(data, fname, header, mode="a")
 
+    @timed
     def write(self, table: str, columns: list[str], data: list[str]) -> None:
         """Function to write data to the database.
 
@@ -125,26 +318,78 @@ class Database:
         @param columns The columns to insert into, as a list of tuples.
 
         @param data The new data to insert, as a list."""
+        placeholders = ", ".join(["?"] * len(data))
         columns = "".join([f", {column}" for column in columns]).lstrip(", ")
-        data = "".join([f", '{line}'" for line in data]).lstrip(", ")
 
-        query = f"INSERT INTO {table} ({columns}) VALUES ({data});"
+        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders});"
 
-        self.cursor.execute(query)
+        self.cursor.execute(query, list(data))
+
+    @timed
+    def write_many(
+        self,
+        table: str,
+        columns: list[str],
+        rows,
+        batch_size: int = 10000,
+        on_conflict: str = None,
+    ) -> int:
+        """Function to write many rows to the database.
 
-    def create_table(self, table: str, columns: list[tuple]) -> None:
+        The rows are inserted with executemany(), batch_size rows per explicit
+        transaction, so a failing batch is rolled back without losing the
+        previous ones. Inside a transaction() each batch is a savepoint.
+
+        @param table The name of the database's table to write to.
+
+        @param columns The columns to insert into.
+
+        @param rows Any iterable of rows, each one a sequence of values.
+
+        @param batch_size The number of rows per transaction.
+
+        @param on_conflict Optionally, "ignore" to skip the rows breaking a
+        unique constraint or "replace" to overwrite the existing ones.
+
+        @returns The number of rows inserted or replaced."""
+        verb = {
+            None: "INSERT",
+            "ignore": "INSERT OR IGNORE",
+            "replace": "INSERT OR REPLACE",
+        }[on_conflict]
+        placeholders = ", ".join(["?"] * len(columns))
+        columns = ", ".join(columns)
+        query = f"{verb} INTO {table} ({columns}) VALUES ({placeholders});"
+
+        count = 0
+        rows = iter(rows)
+        while batch := list(islice(rows, batch_size)):
+            with self.transaction():
+                self.cursor.executemany(query, batch)
+                count += self.cursor.rowcount
+        return count
+
+    @timed
+    def create_table(
+        self, table: str, columns: list[tuple], options: str = None
+    ) -> None:
         """Function to create a table in the database
         @param table The name of the database's table to create
-        @param columns The columns to add, as a list of tuple."""
+        @param columns The columns to add, as a list of tuple. A tuple can also
+        be a table constraint, like ("PRIMARY KEY (Start, End)",)
+        @param options Optionally, the table options, like WITHOUT ROWID"""
 
         columns = ", ".join(
             [" ".join([f"{arg}" for arg in column]).lstrip(" ") for column in columns]
         ).lstrip(", ")
 
         query = f"CREATE TABLE IF NOT EXISTS {table}({columns})"
+        if options:
+            query += f" {options}"
 
         self.cursor.execute(query)
 
+    @timed
     def remove_table(self, table: str) -> None:
         """Function to remove a table in the database
         @param table The name of the database's table to remove"""
@@ -152,6 +397,37 @@ class Database:
 
         self.cursor.execute(query)
 
+    @timed
+    def create_index(self, index: str, table: str, columns: str) -> None:
+        """Function to create an index on a table
+        @param index The name of the index to create
+        @param table The name of the database's table to index
+        @param columns The string of columns, comma-separated, to index"""
+        query = f"CREATE INDEX IF NOT EXISTS {index} ON {table}({columns})"
+
+        self.cursor.execute(query)
+
+    @timed
+    def remove_index(self, index: str) -> None:
+        """Function to remove an index from the database
+        @param index The name of the index to remove"""
+        query = f"DROP INDEX IF EXISTS {index}"
+
+        self.cursor.execute(query)
+
+    @timed
+    def pragma(self, name: str, value=None) -> list:
+        """Function to read or change a setting of the database connection
+        @param name The name of the pragma, e.g. journal_mode
+        @param value Optionally, the new value of the pragma
+        @returns The rows returned by the pragma"""
+        query = f"PRAGMA {name}" if value is None else f"PRAGMA {name} = {value}"
+
+        self.cursor.execute(query)
+
+        return self.cursor.fetchall()
+
+    @timed
     def add_column(self, table: str, column: str, data: str) -> None:
         """Function to add a column to a table
         @param table The name of the database where the column will be added
@@ -161,6 +437,7 @@ class Database:
 
         self.cursor.execute(query)
 
+    @timed
     def remove_column(self, table: str, column: str) -> None:
         """Function to remove a column from a table
         @param table The name of the database where the column will be removed
@@ -169,6 +446,7 @@ class Database:
 
         self.cursor.execute(query)
 
+    @timed
     def change_type(self, table: str, column: str, data: str) -> None:
         """Function to change the type of a column in a table
         @param table The name of the database where the column will be changed
@@ -178,24 +456,75 @@ class Database:
 
         self.cursor.execute(query)
 
-    def delete_rows(self, table: str, condition: str) -> None:
+    @timed
+    def delete_rows(self, table: str, condition: str, parameters: tuple = ()) -> None:
         """Function to delete rows in a table depending on the condition
         @param table The name of the database where to delete
-        @param condition The condition for deletion in the table"""
+        @param condition The condition for deletion in the table
+        @param parameters The values bound to the ? placeholders of the condition"""
         query = f"DELETE FROM {table} WHERE {condition}"
 
-        self.cursor.execute(query)
+        self.cursor.execute(query, parameters)
 
-    def select(self, table: str, columns: str, condition: str) -> None:
+    @timed
+    def select(
+        self, table: str, columns: str, condition: str, parameters: tuple = ()
+    ) -> None:
         """Function to select rows in a table depending on the condition
         @param table The name of the database where to select
-        @param condition The condition for deletion in the table"""
+        @param condition The condition for deletion in the table
+        @param parameters The values bound to the ? placeholders of the condition"""
         query = f"SELECT {columns} FROM {table} WHERE {condition}"
 
-        self.cursor.execute(query)
+        self.cursor.execute(query, parameters)
 
         return self.cursor.fetchall()
 
+    @timed
+    def summarize(
+        self, table: str, columns: str, condition: str = "1", parameters: tuple = ()
+    ) -> list[tuple]:
+        """Function to summarize columns of a table with SQL aggregates, the
+        rows are never fetched. An index on a column makes its maximum and
+        minimum immediate.
+
+        @param table The name of the database's table to summarize.
+
+        @param columns The string of columns, comma-separated, to summarize.
+
+        @param condition Optionally, a WHERE condition with ? placeholders.
+
+        @param parameters The values bound to the placeholders of the condition.
+
+        @returns For every column ((maximum, rowid), (minimum, rowid), average),
+        the rowids being those of a row holding the maximum and the minimum, as
+        summarize_rows() does with positions. For a table without rowid or a
+        view, the tuple of the row_key_() columns of the row replaces its rowid.
+        """
+        columns = [column.strip() for column in columns.split(",")]
+        key = self.row_key_(table)
+        averages = self.select(
+            table,
+            ", ".join(f"AVG({column})" for column in columns),
+            condition,
+            parameters,
+        )[0]
+        ret = []
+        for column, avg in zip(columns, averages):
+            # SQLite reads the bare key from the row holding the MAX or the MIN
+            extrema = []
+            for aggregate in "MAX", "MIN":
+                row = self.select(
+                    table,
+                    f"{aggregate}({column}), {', '.join(key)}",
+                    condition,
+                    parameters,
+                )[0]
+                extrema.append((row[0], row[1] if len(key) == 1 else row[1:]))
+            ret.append((*extrema, avg))
+        return ret
+
+    @timed
     def query(self, sql: str) -> None:
         """Function to query any other SQL statement.
 
@@ -214,23 +543,13 @@ class Database:
 
         @param rows The retrieved data."""
 
-        # split the rows into columns
-        cols = [[r[c] for r in rows] for c in range(len(rows[0]))]
-
         # the time in terms of fractions of hours of how long ago
         # the sample was assumes the sampling period is 10 minutes
         timing = lambda col: f"{(len(rows) - col) / 6.0:.1f}"
 
         ret = []
 
-        for col in cols:
-            hi_ = max(col)
-            hi_t = timing(col.index(hi_))
-
-            lo_ = min(col)
-            lo_t = timing(col.index(lo_))
-
-            avg = sum(col) / len(rows)
-
-            ret.append(((hi_, hi_t), (lo_, lo_t), avg))
+        # a single pass over the rows, see summarize_rows()
+        for (hi_, hi_i), (lo_, lo_i), avg in summarize_rows(rows):
+            ret.append(((hi_, timing(hi_i)), (lo_, timing(lo_i)), avg))
         return ret
@@ -0,0 +1,161 @@
+""" Low overhead statistics of the searches and of the database"""
+from collections import defaultdict
+from functools import wraps
+from inspect import isgeneratorfunction
+import sqlite3
+from threading import Lock, local
+from time import perf_counter
+
+
+class Stats:
+    """Counters of the searches and timings of the Database methods.
+
+    The collection is off until enable() is called. While it is off the
+    searches still count in local variables but report nothing, and the
+    Database methods are called without being timed, so the overhead is a
+    single attribute test per search or per call. The statistics are shared
+    by every thread, they are merged under a lock."""
+
+    def __init__(self, enabled: bool = False) -> None:
+        """The constructor of the Stats class
+
+        @param enabled Whether to collect from the start."""
+        self.enabled = enabled
+        self.lock = Lock()
+        self.counters: dict[str, int] = defaultdict(int)
+        # {name: [calls, seconds, rows]}
+        self.timings: dict[str, list] = defaultdict(lambda: [0, 0.0, 0])
+
+    def enable(self) -> None:
+        """Function to start collecting"""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Function to stop collecting, the statistics collected so far are kept"""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Function to drop every statistic collected so far"""
+        with self.lock:
+            self.counters.clear()
+            self.timings.clear()
+
+    def count(self, prefix: str, **counters: int) -> None:
+        """Function to add counters, named prefix.name, usually once per search"""
+        with self.lock:
+            for name, value in counters.items():
+                self.counters[f"{prefix}.{name}"] += value
+
+    def time(self, name: str, seconds: float, rows: int = 0) -> None:
+        """Function to add one timed call of an operation and the rows it handled"""
+        with self.lock:
+            timing = self.timings[name]
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] += rows
+
+    def snapshot(self) -> dict:
+        """Function to get a copy of the statistics:
+        {"counters": {name: value}, "timings": {name: {"calls", "seconds", "rows"}}}
+        """
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "timings": {
+                    name: {"calls": calls, "seconds": seconds, "rows": rows}
+                    for name, (calls, seconds, rows) in self.timings.items()
+                },
+            }
+
+    def report(self) -> str:
+        """Function to format the statistics as text, the slowest operations first"""
+        snapshot = self.snapshot()
+        lines = [
+            f"{name:<32} {value:>12}"
+            for name, value in sorted(snapshot["counters"].items())
+        ]
+        timings = sorted(
+            snapshot["timings"].items(),
+            key=lambda item: item[1]["seconds"],
+            reverse=True,
+        )
+        if timings:
+            lines.append(f"{'operation':<32} {'calls':>8} {'ms':>10} {'rows':>10}")
+        for name, timing in timings:
+            lines.append(
+                f"{name:<32} {timing['calls']:>8} "
+                f"{timing['seconds'] * 1000:>10.1f} {timing['rows']:>10}"
+            )
+        return "\n".join(lines)
+
+
+stats = Stats()
+
+
+def changes_(database) -> int:
+    """Function to get the number of rows changed through the connection of a Database"""
+    try:
+        return database.conn.total_changes
+    except (AttributeError, sqlite3.ProgrammingError):
+        return 0
+
+
+# The timed calls running in the current thread
+running_ = local()
+
+
+def timed(method):
+    """Decorator timing every call of a Database method in stats, under the
+    name Database.method. The rows are the rows returned, or else the rows
+    changed. The time of a generator is the time spent producing its rows,
+    not the time its caller spends between them. A call made by another timed
+    method, like get_last() calling get(), is only counted in the outer one."""
+    name = method.__qualname__
+
+    if isgeneratorfunction(method):
+
+        @wraps(method)
+        def generator(self, *args, **kwargs):
+            if not stats.enabled or getattr(running_, "depth", 0):
+                return (yield from method(self, *args, **kwargs))
+            iterator = method(self, *args, **kwargs)
+            seconds, rows = 0.0, 0
+            try:
+                while True:
+                    start = perf_counter()
+                    try:
+                        row = next(iterator)
+                    except StopIteration:
+                        break
+                    finally:
+                        seconds += perf_counter() - start
+                    rows += 1
+                    yield row
+            finally:
+                iterator.close()
+                stats.time(name, seconds, rows)
+
+        return generator
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not stats.enabled or getattr(running_, "depth", 0):
+            return method(self, *args, **kwargs)
+        changes = changes_(self)
+        running_.depth = 1
+        start = perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            running_.depth = 0
+        seconds = perf_counter() - start
+        if isinstance(result, list):
+            rows = len(result)
+        elif isinstance(result, int):
+            rows = result
+        else:
+            rows = max(changes_(self) - changes, 0)
+        stats.time(name, seconds, rows)
+        return result
+
+    return wrapper
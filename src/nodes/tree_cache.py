@@ -0,0 +1,63 @@
+""" Cache of the shortest path trees computed by dijkstra"""
+from collections import OrderedDict
+
+
+class TreeCache:
+    """A bounded least recently used cache of [dist, precedent] trees.
+
+    Trees are keyed by their starting node and by the version of the graph
+    they were computed on. Any change to the graph must be followed by a call
+    to bump(), which increments the version and drops every stored tree."""
+
+    def __init__(self, maxsize: int = 16) -> None:
+        """The constructor of the TreeCache class
+
+        @param maxsize The maximum number of trees kept in the cache."""
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.trees = OrderedDict()
+
+    def get(self, start: str) -> list[dict[str, int], dict[str, str]]:
+        """Function to get the tree of a starting node, or None if it is not cached
+
+        @param start The starting node of the tree."""
+        key = (start, self.version)
+        tree = self.trees.get(key)
+        if tree is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.trees.move_to_end(key)
+        return tree
+
+    def put(self, start: str, tree: list[dict[str, int], dict[str, str]]) -> None:
+        """Function to store the tree of a starting node, evicting the least
+        recently used one if the cache is full
+
+        @param start The starting node of the tree.
+
+        @param tree The [dist, precedent] tree returned by dijkstra()."""
+        self.trees[(start, self.version)] = tree
+        self.trees.move_to_end((start, self.version))
+        while len(self.trees) > self.maxsize:
+            self.trees.popitem(last=False)
+
+    def bump(self) -> int:
+        """Function to signal a change of the graph, every cached tree becomes stale
+
+        @returns The new version of the graph."""
+        self.version += 1
+        self.trees.clear()
+        return self.version
+
+    def stats(self) -> dict[str, int]:
+        """Function to get the statistics of the cache"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.trees),
+            "maxsize": self.maxsize,
+            "version": self.version,
+        }
@@ -0,0 +1,52 @@
+""" Shared fixtures of the tests: random graphs and a reference dijkstra"""
+import random
+from heapq import heappop, heappush
+import pytest
+import nodes as nd
+
+
+def random_graph(seed: int, node_count: int = 40, edge_count: int = 120) -> dict:
+    """Function to build a random directed graph {'A': {'B': lenght},...}, some
+    of its nodes being unreachable from the others"""
+    generator = random.Random(seed)
+    names = [f"n{index}" for index in range(node_count)]
+    graph = {}
+    for _ in range(edge_count):
+        start, end = generator.sample(names, 2)
+        graph.setdefault(start, {})[end] = generator.randint(1, 20)
+    return graph
+
+
+def reference_dijkstra(graph: dict, start: str) -> dict[str, int]:
+    """Function to get the distances from start with a textbook dijkstra, the
+    one every engine is compared with"""
+    dist = {start: 0}
+    heap = [(0, start)]
+    done = set()
+    while heap:
+        dist_1, node_1 = heappop(heap)
+        if node_1 in done:
+            continue
+        done.add(node_1)
+        for node_2, lenght in graph.get(node_1, {}).items():
+            if dist_1 + lenght < dist.get(node_2, dist_1 + lenght + 1):
+                dist[node_2] = dist_1 + lenght
+                heappush(heap, (dist_1 + lenght, node_2))
+    return dist
+
+
+def path_lenght(graph: dict, path: list[str]) -> int:
+    """Function to get the length of a path given from the end to the start"""
+    path = path[::-1]
+    return sum(graph[first][second] for first, second in zip(path, path[1:]))
+
+
+@pytest.fixture(params=range(5))
+def graph(request) -> dict:
+    return random_graph(request.param)
+
+
+@pytest.fixture(autouse=True)
+def close_connections():
+    yield
+    nd.connections.close()
@@ -0,0 +1,105 @@
+""" Every search engine compared with a reference dijkstra on random graphs"""
+import random
+import nodes as nd
+from conftest import path_lenght, reference_dijkstra
+
+
+def nodes_of(graph: dict) -> list[str]:
+    return sorted(set(graph) | {end for edges in graph.values() for end in edges})
+
+
+def test_dijkstra(graph):
+    csr = nd.CSRGraph.from_edges(nd.iter_edges(graph))
+    for start in nodes_of(graph):
+        expected = reference_dijkstra(graph, start)
+        for searched in graph, csr:
+            dist, precedent = nd.dijkstra(searched, start)
+            assert dist == expected
+            for end in dist:
+                path = nd.find_shortest_path(start, end, precedent)
+                assert path_lenght(graph, path) == dist[end]
+
+
+def test_dijkstra_target(graph):
+    for start in nodes_of(graph):
+        expected = reference_dijkstra(graph, start)
+        for end in expected:
+            assert nd.dijkstra(graph, start, target=end)[0][end] == expected[end]
+
+
+def test_bounded_dijkstra(graph):
+    for start in nodes_of(graph):
+        expected = reference_dijkstra(graph, start)
+        reached = list(nd.bounded_dijkstra(graph, start, radius=15))
+        assert {node: distance for node, distance, _ in reached} == {
+            node: distance for node, distance in expected.items() if distance <= 15
+        }
+        distances = [distance for _, distance, _ in reached]
+        assert distances == sorted(distances)
+        nearest = list(nd.bounded_dijkstra(graph, start, count=5))
+        assert [distance for _, distance, _ in nearest] == sorted(expected.values())[:5]
+
+
+def test_point_to_point_engines(graph):
+    reverse = nd.build_reverse_graph(graph)
+    landmarks = nd.Landmarks.select(graph, reverse, k=4)
+    hierarchy = nd.ContractionHierarchy.build(nd.iter_edges(graph))
+    engines = {
+        "bidirectional": {},
+        "astar": {"landmarks": landmarks},
+        "hierarchy": {"hierarchy": hierarchy},
+    }
+    names = nodes_of(graph)
+    for start in names:
+        expected = reference_dijkstra(graph, start)
+        for end in names:
+            for engine, data in engines.items():
+                distance, path = nd.shortest_path(graph, reverse, start, end, **data)
+                assert distance == expected.get(end), (engine, start, end)
+                if distance is not None:
+                    assert path[0] == end and path[-1] == start
+                    assert path_lenght(graph, path) == distance
+
+
+def test_same_node_on_every_engine(graph):
+    reverse = nd.build_reverse_graph(graph)
+    landmarks = nd.Landmarks.select(graph, reverse, k=4)
+    hierarchy = nd.ContractionHierarchy.build(nd.iter_edges(graph))
+    for node in "n0", "missing":
+        for data in {}, {"landmarks": landmarks}, {"hierarchy": hierarchy}:
+            assert nd.shortest_path(graph, reverse, node, node, **data) == [
+                0,
+                [node],
+            ]
+
+
+def test_dynamic_sssp(graph):
+    generator = random.Random(len(graph))
+    names = nodes_of(graph)
+    start = names[0]
+    reverse = nd.build_reverse_graph(graph)
+    dist, precedent = nd.dijkstra(graph, start)
+    for _ in range(60):
+        first, second = generator.sample(names, 2)
+        if generator.random() < 0.5 and graph.get(first, {}).get(second):
+            nd.delete_edge(graph, dist, precedent, first, second, reverse)
+        else:
+            lenght = generator.randint(1, 20)
+            nd.insert_edge(graph, dist, precedent, first, second, lenght, reverse)
+        reached = {node: value for node, value in dist.items() if value < nd.MAX_VALUE}
+        assert reached == reference_dijkstra(graph, start)
+        assert reverse == nd.build_reverse_graph(graph)
+        for end in reached:
+            path = nd.find_shortest_path(start, end, precedent)
+            assert path_lenght(graph, path) == reached[end]
+
+
+def test_distance_matrix(graph):
+    sources = nodes_of(graph)[:6]
+    csr = nd.CSRGraph.from_edges(nd.iter_edges(graph))
+    expected = sorted(
+        (start, end, distance)
+        for start in sources
+        for end, distance in reference_dijkstra(graph, start).items()
+    )
+    assert sorted(nd.distance_matrix(csr, sources, workers=2)) == expected
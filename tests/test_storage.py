@@ -0,0 +1,140 @@
+""" Round trips of the graph through the database: snapshot, migration,
+pagination, route cache and the saved search data"""
+import sqlite3
+import pytest
+import nodes as nd
+from conftest import random_graph
+
+
+def schema_of(db: nd.Database) -> list:
+    return sorted(db.select("sqlite_master", "type, name", "1"))
+
+
+def legacy_file(path, edges) -> str:
+    """Function to write a version 1 file the way the first releases did: a
+    Paths table, with neither indexes nor version triggers"""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE Paths (ID text PRIMARY KEY, Start text NOT NULL, "
+        "End text NOT NULL, Length integer NOT NULL)"
+    )
+    conn.executemany(
+        "INSERT INTO Paths VALUES (?, ?, ?, ?)",
+        (
+            (nd.id_generator(start + end), start, end, lenght)
+            for start, end, lenght in edges
+        ),
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture(params=[True, False], ids=["compact", "legacy"])
+def store(request, tmp_path) -> nd.EdgeStore:
+    db = nd.Database(str(tmp_path / "paths.db"))
+    store = nd.EdgeStore.create(db, compact=request.param)
+    store.insert_many(nd.iter_edges(random_graph(0)))
+    db.conn.commit()
+    return store
+
+
+def test_snapshot_round_trip(store):
+    store.insert("", "n1", 4)
+    store.insert("n2", "", 6)
+    store.db.conn.commit()
+    fname = f"{store.db.name}.graph"
+    graph = nd.write_snapshot(store.db, fname)
+    snapshot, version = nd.read_snapshot(fname)
+    assert "" in snapshot.names and len(snapshot.names) == snapshot.node_count
+    assert snapshot.to_dict() == graph.to_dict()
+    assert snapshot.to_dict() == nd.build_graph(store.edges())
+    assert version == nd.graph_version(store.db)
+    snapshot.close()
+
+
+def test_snapshot_rebuilt_when_stale(store):
+    graph = nd.load_snapshot(store.db)
+    store.insert("n0", "new", 3)
+    store.db.conn.commit()
+    rebuilt = nd.load_snapshot(store.db)
+    assert rebuilt.edge_count == graph.edge_count + 1
+    assert rebuilt["n0"]["new"] == 3
+
+
+def test_snapshot_does_not_write_the_database(tmp_path):
+    path = legacy_file(tmp_path / "old.db", nd.iter_edges(random_graph(1)))
+    with nd.Database(path) as db:
+        schema = schema_of(db)
+        graph = nd.load_snapshot(db)
+        assert nd.load_snapshot(db).to_dict() == graph.to_dict()
+        assert schema_of(db) == schema
+        db.write("Paths", ("ID", "Start", "End", "Length"), ("x", "a", "b", 1))
+        assert nd.load_snapshot(db)["a"] == {"b": 1}
+
+
+def test_migration(tmp_path):
+    edges = sorted(nd.iter_edges(random_graph(2)))
+    path = legacy_file(tmp_path / "old.db", edges)
+    with nd.Database(path) as db:
+        db.query("CREATE INDEX Paths_Start ON Paths(Start)")
+        assert nd.migrate_to_compact(db) == len(edges)
+        assert nd.schema_version(db) == 2
+        assert sorted(map(list, nd.EdgeStore(db).edges())) == edges
+        indexes = [name for kind, name in schema_of(db) if kind == "index"]
+        assert "Paths_Start" not in indexes and "Paths_Forward" not in indexes
+        version = nd.graph_version(db)
+        nd.EdgeStore(db).insert("a", "b", 1)
+        assert nd.graph_version(db) == version + 1
+        assert nd.migrate_to_compact(db) == 0
+
+
+def test_pagination(store):
+    store.insert("m", "n5", 2)
+    expected = sorted(store.edges())
+    pages, after = [], None
+    while page := store.page(after, limit=7):
+        pages.extend(page)
+        after = page[-1][:2]
+    assert pages == expected
+    assert store.page(prefix="n1", limit=1000) == [
+        edge for edge in expected if edge[0].startswith("n1")
+    ]
+
+
+def test_route_cache(store):
+    graph = nd.load_snapshot(store.db)
+    reverse = nd.build_reverse_graph(graph)
+    schema = schema_of(store.db)
+    cache = nd.RouteCache(store.db, maxsize=3)
+    assert cache.get("n0", "n1") is None and schema_of(store.db) == schema
+    expected = nd.shortest_path(graph, reverse, "n0", "n1")
+    assert cache.route(graph, reverse, "n0", "n1") == expected
+    assert cache.route(graph, reverse, "n0", "n1") == expected
+    assert cache.hits and store.db.select("Routes", "Hits", "1") == [(1,)]
+    cache.flush()
+    assert not cache.hits and store.db.select("Routes", "Hits", "1") == [(2,)]
+    for end in "n2", "n3", "n4":
+        cache.route(graph, reverse, "n0", end)
+    assert len(store.db.select("Routes", "Start", "1")) == 3
+    store.insert("n0", "n4", 1)
+    assert cache.get("n0", "n4") is None
+
+
+def test_saved_search_data(store):
+    graph = nd.load_snapshot(store.db)
+    reverse = nd.build_reverse_graph(graph)
+    nd.Landmarks.select(graph, reverse, k=4).save(store.db)
+    nd.ContractionHierarchy.build(nd.iter_edges(graph)).save(store.db)
+    landmarks = nd.Landmarks.load(store.db)
+    hierarchy = nd.ContractionHierarchy.load(store.db)
+    assert landmarks is not None and hierarchy is not None
+    for end in graph.keys():
+        expected = nd.shortest_path(graph, reverse, "n0", end)[0]
+        assert nd.shortest_path(graph, reverse, "n0", end, hierarchy)[0] == expected
+        assert nd.shortest_path(graph, reverse, "n0", end, None, landmarks)[0] == (
+            expected
+        )
+    store.delete("n0", next(iter(graph["n0"])))
+    assert nd.Landmarks.load(store.db) is None
+    assert nd.ContractionHierarchy.load(store.db) is None